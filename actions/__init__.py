@@ -0,0 +1 @@
+# Rasa custom actions
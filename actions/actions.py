@@ -1,9 +1,23 @@
 import re
-from typing import Text, Dict, Any, List
+from datetime import datetime
+from typing import Text, Dict, Any, List, Optional
 from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet, FollowupAction, ActiveLoop
-import sqlite3
+
+from actions import db
+from actions.reports import submit_report
+
+EVENT_DATE_FORMATS = ["%d.%m.%Y", "%d.%m.%y", "%Y-%m-%d"]
+
+
+def parse_event_date(value: Optional[str]) -> Optional[datetime]:
+    for date_format in EVENT_DATE_FORMATS:
+        try:
+            return datetime.strptime((value or "").strip(), date_format)
+        except ValueError:
+            continue
+    return None
 
 # ... (ваш код init_db и другие классы без изменений) ...
 
@@ -12,16 +26,14 @@ class ActionCheckAdmin(Action):
     def name(self) -> Text:
         return "action_check_admin"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         phone_number = tracker.get_slot("phone_number")
         
-        # Список номеров администраторов (можно вынести в конфиг)
-        admin_phones = ["+70000000000", "80000000000"] # Замените на реальные номера
-        
-        is_admin = phone_number in admin_phones
+        # Администраторы из ADMIN_PHONES или с флагом is_admin в БД
+        is_admin = await db.is_admin(phone_number)
         
         return [SlotSet("is_admin", is_admin)]
 
@@ -40,11 +52,27 @@ class ActionSaveEvent(Action):
     def name(self) -> Text:
         return "action_save_event"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        event_date = parse_event_date(tracker.get_slot("event_date"))
+        if event_date is None:
+            dispatcher.utter_message(text="Не удалось распознать дату мероприятия (ДД.ММ.ГГГГ).")
+            return [SlotSet("event_date", None)]
+        
+        event = await db.save_event(
+            creator_phone=tracker.get_slot("phone_number"),
+            title=tracker.get_slot("event_title"),
+            event_date=event_date,
+            event_time=tracker.get_slot("event_time"),
+            address=tracker.get_slot("event_location"),
+            description=tracker.get_slot("event_description")
+        )
+        if event is None:
+            dispatcher.utter_message(text="Сначала завершите регистрацию.")
+            return []
+        
         dispatcher.utter_message(text="Мероприятие сохранено!")
-        # Здесь будет логика сохранения в БД
         return []
 
 class ActionCancelEvent(Action):
@@ -67,23 +95,37 @@ class ActionAdminUploadLists(Action):
         dispatcher.utter_message(text="Функция загрузки списков в разработке.")
         return []
 
+async def generate_report(dispatcher: CollectingDispatcher, tracker: Tracker, report: str, title: str):
+    """Start background report export, the file is sent to the chat when ready"""
+    phone_number = tracker.get_slot("phone_number")
+    if not await db.is_admin(phone_number):
+        dispatcher.utter_message(text="❌ У вас нет прав администратора!")
+        return
+    
+    # Telegram channel and the bot use chat id as sender id
+    if not tracker.sender_id.isdigit():
+        dispatcher.utter_message(text="Отчеты отправляются только в Telegram.")
+        return
+    
+    await submit_report(report, int(tracker.sender_id), phone_number, title)
+    dispatcher.utter_message(text="⏳ Формирую отчет. Файл придет в этот чат, как только будет готов.")
+
 class ActionAdminGenerateUsersReport(Action):
     def name(self) -> Text:
         return "action_admin_generate_users_report"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        dispatcher.utter_message(text="Генерирую отчет по пользователям...")
+        await generate_report(dispatcher, tracker, "users", "📊 <b>Отчет по пользователям</b>")
         return []
 
 class ActionAdminGenerateEventsReport(Action):
     def name(self) -> Text:
         return "action_admin_generate_events_report"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        dispatcher.utter_message(text="Генерирую отчет по мероприятиям...")
+        await generate_report(dispatcher, tracker, "events", "📈 <b>Отчет по мероприятиям</b>")
         return []
-
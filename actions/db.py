@@ -0,0 +1,130 @@
+"""
+Shared async database access for the Rasa action server.
+
+Actions reuse the bot's SQLAlchemy models and database, so the schema is
+defined in one place (app/database/models). One pooled engine serves all
+concurrent action calls; SQLite connections run in WAL mode so readers do
+not wait for the writer. Queries are module-level constructs with bound
+parameters, compiled once and reused from SQLAlchemy's statement cache.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import bindparam, event, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import settings
+from app.database.models import Base, User, Event
+
+DATABASE_URL = settings.actions_database_url or settings.database_url
+
+
+def create_actions_engine(url: str) -> AsyncEngine:
+    """Pooled engine, SQLite connections switched to WAL mode"""
+    if url.startswith("sqlite") and ":memory:" not in url:
+        # aiosqlite defaults to NullPool for files, keep connections open instead
+        engine = create_async_engine(
+            url,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.actions_db_pool_size,
+            max_overflow=settings.actions_db_max_overflow,
+        )
+        
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={settings.actions_db_busy_timeout}")
+            cursor.close()
+        
+        return engine
+    
+    if url.startswith("sqlite"):
+        return create_async_engine(url)
+    
+    return create_async_engine(
+        url,
+        pool_size=settings.actions_db_pool_size,
+        max_overflow=settings.actions_db_max_overflow,
+        pool_pre_ping=True,
+    )
+
+
+engine = create_actions_engine(DATABASE_URL)
+AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+# Prepared queries
+USER_BY_PHONE = select(User).where(User.phone_number == bindparam("phone"))
+USER_ID_BY_PHONE = select(User.id).where(User.phone_number == bindparam("phone"))
+
+
+@asynccontextmanager
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Session from the shared pool, rolled back on errors"""
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def init_database():
+    """Create tables of the shared schema"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def close_database():
+    await engine.dispose()
+
+
+async def get_user_by_phone(phone: str) -> Optional[User]:
+    async with get_session() as session:
+        result = await session.execute(USER_BY_PHONE, {"phone": phone})
+        return result.scalar_one_or_none()
+
+
+async def is_admin(phone: str) -> bool:
+    """Admin by ADMIN_PHONES setting or by user flag"""
+    if not phone:
+        return False
+    if phone in settings.admin_phone_list:
+        return True
+    
+    user = await get_user_by_phone(phone)
+    return bool(user and user.is_admin)
+
+
+async def save_event(
+    creator_phone: str,
+    title: str,
+    event_date: datetime,
+    event_time: str,
+    address: str,
+    description: str = None
+) -> Optional[Event]:
+    """Create event of a registered user, None when the user is unknown"""
+    async with get_session() as session:
+        creator_id = (await session.execute(USER_ID_BY_PHONE, {"phone": creator_phone})).scalar_one_or_none()
+        if creator_id is None:
+            return None
+        
+        new_event = Event(
+            title=title,
+            description=description,
+            event_date=event_date,
+            event_time=event_time,
+            address=address,
+            creator_id=creator_id,
+            created_at=datetime.utcnow()
+        )
+        session.add(new_event)
+        await session.commit()
+        return new_event
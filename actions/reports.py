@@ -0,0 +1,40 @@
+"""
+Admin reports for the Rasa action server.
+
+Reports are produced by the shared chunked exporter (app/reports) in a
+background job pool, so the action returns right away and never hits the
+Rasa -> action server timeout. The finished file is sent to the admin's
+Telegram chat as a document.
+"""
+
+from typing import Optional
+
+from aiogram import Bot
+
+from actions import db
+from app.bot.handlers.admin import report_sender
+from app.reports.jobs import ExportJob, ExportJobManager
+
+# Global instance, jobs read through the action server's pooled engine
+report_jobs = ExportJobManager(session_factory=db.AsyncSessionLocal)
+
+_bot: Optional[Bot] = None
+
+
+def get_bot() -> Bot:
+    """Bot used to deliver report files, created on first use"""
+    global _bot
+    if _bot is None:
+        from app.bot.main import create_bot
+        _bot = create_bot()
+    return _bot
+
+
+async def submit_report(report: str, chat_id: int, admin_phone: str, title: str) -> ExportJob:
+    """Start report export, the file is sent to chat_id when ready"""
+    return await report_jobs.submit(
+        report,
+        "xlsx",
+        admin_phone=admin_phone,
+        callback=report_sender(get_bot(), chat_id, title)
+    )
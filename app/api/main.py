@@ -8,7 +8,11 @@ from pathlib import Path
 
 from app.config import settings
 from app.database.connection import get_session, init_database, close_database
-from app.api.routes import admin, files, maps
+from app.api.routes import admin, files, maps, telegram
+from app.bot.webhook import webhook_processor
+from app.maps.geocoder import geocoder
+from app.reports.jobs import export_jobs
+from app.utils.metrics import metrics, load_published
 
 app = FastAPI(
     title="Test Bot API",
@@ -23,17 +27,26 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 app.include_router(files.router, prefix="/api/files", tags=["files"])
 app.include_router(maps.router, prefix="/api/maps", tags=["maps"])
+app.include_router(telegram.router, prefix="/api/telegram", tags=["telegram"])
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
     await init_database()
+    export_jobs.start()
+    
+    if settings.bot_mode == "webhook":
+        from app.bot.main import create_bot, create_dispatcher
+        await webhook_processor.start(create_bot(), create_dispatcher())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close database connections on shutdown"""
+    """Stop background workers and close database connections on shutdown"""
+    await webhook_processor.stop()
+    await export_jobs.stop()
+    await geocoder.close()
     await close_database()
 
 
@@ -45,3 +58,12 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """API counters plus snapshots published by other processes (bot)"""
+    return {
+        **metrics.snapshot(),
+        "processes": load_published(settings.metrics_dir)
+    }
@@ -1,19 +1,36 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import pandas as pd
-import io
 import os
+import tempfile
+import time
 from datetime import datetime
 
 from app.config import settings
 from app.database.connection import get_session
-from app.database.models import User, Event, Interest, Region, AdminAction, AdminActionType, UserInterest, EventInterest, EventParticipant
+from app.database.bulk import insert_ignore
+from app.database.models import User, Interest, Region, AdminAction, AdminActionType
+from app.reports.export import export_report, iter_file, EXPORT_FORMATS
+from app.reports.jobs import export_jobs, ExportJob, ExportJobStatus
 
 router = APIRouter()
 
 
+UPLOAD_COLUMNS = {
+    "regions": Region,
+    "interests": Interest,
+}
+
+
+def normalize_names(column: pd.Series) -> pd.Series:
+    """Strip, drop empty values and deduplicate names"""
+    names = column.dropna().astype(str).str.strip()
+    return names[names != ""].drop_duplicates()
+
+
 async def verify_admin_phone(phone_number: str) -> bool:
     """Verify if phone number belongs to admin"""
     return phone_number in settings.admin_phone_list
@@ -34,9 +51,12 @@ async def upload_data(
         raise HTTPException(status_code=400, detail="Файл должен быть в формате Excel")
     
     try:
-        # Read Excel file
-        content = await file.read()
-        df = pd.read_excel(io.BytesIO(content))
+        started = time.perf_counter()
+        
+        # Parse uploaded spool file directly, only the expected columns
+        df = await run_in_threadpool(
+            pd.read_excel, file.file, usecols=lambda column: column in UPLOAD_COLUMNS
+        )
         
         # Expected columns: 'regions', 'interests'
         if 'regions' not in df.columns and 'interests' not in df.columns:
@@ -45,34 +65,22 @@ async def upload_data(
                 detail="Файл должен содержать колонки 'regions' и/или 'interests'"
             )
         
-        regions_added = 0
-        interests_added = 0
-        
-        # Process regions
-        if 'regions' in df.columns:
-            for region_name in df['regions'].dropna().unique():
-                if region_name.strip():
-                    # Check if region already exists
-                    result = await session.execute(
-                        select(Region).where(Region.name == region_name.strip())
-                    )
-                    if not result.scalar_one_or_none():
-                        region = Region(name=region_name.strip())
-                        session.add(region)
-                        regions_added += 1
+        stats = {}
+        for column, model in UPLOAD_COLUMNS.items():
+            names = normalize_names(df[column]) if column in df.columns else pd.Series(dtype=str)
+            
+            # Load existing names once and insert only the difference
+            existing = (await session.execute(select(model.name))).scalars().all()
+            new_names = names[~names.isin(existing)]
+            added = await insert_ignore(
+                session, model, [{"name": name} for name in new_names], ["name"]
+            )
+            
+            stats[f"{column}_added"] = added
+            stats[f"{column}_skipped"] = len(names) - added
         
-        # Process interests
-        if 'interests' in df.columns:
-            for interest_name in df['interests'].dropna().unique():
-                if interest_name.strip():
-                    # Check if interest already exists
-                    result = await session.execute(
-                        select(Interest).where(Interest.name == interest_name.strip())
-                    )
-                    if not result.scalar_one_or_none():
-                        interest = Interest(name=interest_name.strip())
-                        session.add(interest)
-                        interests_added += 1
+        regions_added = stats["regions_added"]
+        interests_added = stats["interests_added"]
         
         # Get admin user
         admin_result = await session.execute(
@@ -92,12 +100,18 @@ async def upload_data(
         
         await session.commit()
         
+        elapsed = time.perf_counter() - started
+        processed = sum(stats[f"{column}_added"] + stats[f"{column}_skipped"] for column in UPLOAD_COLUMNS)
+        
         return {
             "message": "Данные успешно загружены",
-            "regions_added": regions_added,
-            "interests_added": interests_added
+            **stats,
+            "elapsed": round(elapsed, 3),
+            "rows_per_second": round(processed / elapsed) if elapsed else processed
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=400, detail=f"Ошибка обработки файла: {str(e)}")
@@ -106,49 +120,20 @@ async def upload_data(
 @router.get("/export-users")
 async def export_users(
     admin_phone: str,
+    export_format: str = Query("xlsx", alias="format", pattern="^(xlsx|csv)$"),
     session: AsyncSession = Depends(get_session)
 ):
-    """Export users data to Excel"""
+    """Export users data to Excel or CSV"""
     
     if not admin_phone or not await verify_admin_phone(admin_phone):
         raise HTTPException(status_code=403, detail="Нет прав администратора")
     
+    output = tempfile.SpooledTemporaryFile(max_size=settings.export_spool_size)
     try:
-        # Get all users with their data
-        result = await session.execute(
-            select(User, Region.name.label('region_name'))
-            .join(Region, User.region_id == Region.id)
+        # Stream users from the database in chunks straight into the report file
+        exported = await export_report(
+            session, "users", export_format, output, settings.export_chunk_size
         )
-        users_data = result.all()
-        
-        # Prepare data for export
-        export_data = []
-        for user, region_name in users_data:
-            # Get user interests
-            interests_result = await session.execute(
-                select(Interest.name)
-                .join(UserInterest, Interest.id == UserInterest.interest_id)
-                .where(UserInterest.user_id == user.id)
-            )
-            interests = [interest[0] for interest in interests_result.all()]
-            
-            export_data.append({
-                'Номер телефона': user.phone_number,
-                'Имя': user.first_name,
-                'Фамилия': user.last_name,
-                'Возраст': user.age,
-                'Пол': user.gender.value if user.gender else '',
-                'Регион': region_name,
-                'Интересы': ', '.join(interests),
-                'Ссылка на фото': user.photo_url or ''
-            })
-        
-        # Create Excel file
-        df = pd.DataFrame(export_data)
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Пользователи', index=False)
-        output.seek(0)
         
         # Log admin action
         admin_result = await session.execute(
@@ -160,77 +145,40 @@ async def export_users(
             action = AdminAction(
                 admin_user_id=admin_user.id,
                 action_type=AdminActionType.EXPORT_USERS,
-                description=f"Экспорт {len(export_data)} пользователей",
+                description=f"Экспорт {exported} пользователей",
                 created_at=datetime.utcnow()
             )
             session.add(action)
             await session.commit()
         
         return StreamingResponse(
-            io.BytesIO(output.read()),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": "attachment; filename=users_export.xlsx"}
+            iter_file(output),
+            media_type=EXPORT_FORMATS[export_format],
+            headers={"Content-Disposition": f"attachment; filename=users_export.{export_format}"}
         )
         
     except Exception as e:
+        output.close()
         raise HTTPException(status_code=500, detail=f"Ошибка экспорта: {str(e)}")
 
 
 @router.get("/export-events")
 async def export_events(
     admin_phone: str,
+    export_format: str = Query("xlsx", alias="format", pattern="^(xlsx|csv)$"),
     session: AsyncSession = Depends(get_session)
 ):
-    """Export events data to Excel"""
+    """Export events data to Excel or CSV"""
     
     if not admin_phone or not await verify_admin_phone(admin_phone):
         raise HTTPException(status_code=403, detail="Нет прав администратора")
     
+    output = tempfile.SpooledTemporaryFile(max_size=settings.export_spool_size)
     try:
-        # Get all events with creator info
-        result = await session.execute(
-            select(Event, User.first_name, User.last_name, User.phone_number)
-            .join(User, Event.creator_id == User.id)
+        # Stream events from the database in chunks straight into the report file
+        exported = await export_report(
+            session, "events", export_format, output, settings.export_chunk_size
         )
-        events_data = result.all()
-        
-        # Prepare data for export
-        export_data = []
-        for event, creator_first_name, creator_last_name, creator_phone in events_data:
-            # Get event interests
-            interests_result = await session.execute(
-                select(Interest.name)
-                .join(EventInterest, Interest.id == EventInterest.interest_id)
-                .where(EventInterest.event_id == event.id)
-            )
-            interests = [interest[0] for interest in interests_result.all()]
-            
-            # Get participants
-            participants_result = await session.execute(
-                select(User.first_name, User.last_name)
-                .join(EventParticipant, User.id == EventParticipant.user_id)
-                .where(EventParticipant.event_id == event.id)
-            )
-            participants = [f"{p[0]} {p[1]}" for p in participants_result.all()]
-            
-            export_data.append({
-                'Название': event.title,
-                'Дата': event.event_date.strftime('%Y-%m-%d'),
-                'Время': event.event_time,
-                'Интересы': ', '.join(interests),
-                'Адрес': event.address,
-                'Описание': event.description or '',
-                'Ссылка на изображение': event.image_url or '',
-                'Организатор': f"{creator_first_name} {creator_last_name} ({creator_phone})",
-                'Участники': '; '.join(participants)
-            })
-        
-        # Create Excel file
-        df = pd.DataFrame(export_data)
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Мероприятия', index=False)
-        output.seek(0)
         
         # Log admin action
         admin_result = await session.execute(
@@ -242,17 +190,80 @@ async def export_events(
             action = AdminAction(
                 admin_user_id=admin_user.id,
                 action_type=AdminActionType.EXPORT_EVENTS,
-                description=f"Экспорт {len(export_data)} мероприятий",
+                description=f"Экспорт {exported} мероприятий",
                 created_at=datetime.utcnow()
             )
             session.add(action)
             await session.commit()
         
         return StreamingResponse(
-            io.BytesIO(output.read()),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": "attachment; filename=events_export.xlsx"}
+            iter_file(output),
+            media_type=EXPORT_FORMATS[export_format],
+            headers={"Content-Disposition": f"attachment; filename=events_export.{export_format}"}
         )
         
     except Exception as e:
+        output.close()
         raise HTTPException(status_code=500, detail=f"Ошибка экспорта: {str(e)}")
+
+
+def export_job_response(job: ExportJob) -> dict:
+    """Export job handle with status and download links"""
+    return {
+        **job.to_dict(),
+        "status_url": f"/api/admin/exports/{job.id}",
+        "download_url": f"/api/admin/exports/{job.id}/download"
+    }
+
+
+@router.post("/exports", status_code=202)
+async def create_export(
+    admin_phone: str,
+    report: str = Query(..., pattern="^(users|events)$"),
+    export_format: str = Query("xlsx", alias="format", pattern="^(xlsx|csv)$")
+):
+    """Enqueue users or events export job"""
+    
+    if not admin_phone or not await verify_admin_phone(admin_phone):
+        raise HTTPException(status_code=403, detail="Нет прав администратора")
+    
+    job = await export_jobs.submit(report, export_format, admin_phone=admin_phone)
+    return export_job_response(job)
+
+
+@router.get("/exports/{job_id}")
+async def get_export(job_id: str, admin_phone: str):
+    """Get export job status"""
+    
+    if not admin_phone or not await verify_admin_phone(admin_phone):
+        raise HTTPException(status_code=403, detail="Нет прав администратора")
+    
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Экспорт не найден")
+    
+    return export_job_response(job)
+
+
+@router.get("/exports/{job_id}/download")
+async def download_export(job_id: str, admin_phone: str):
+    """Download finished export file"""
+    
+    if not admin_phone or not await verify_admin_phone(admin_phone):
+        raise HTTPException(status_code=403, detail="Нет прав администратора")
+    
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Экспорт не найден")
+    
+    if job.status == ExportJobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=f"Ошибка экспорта: {job.error}")
+    
+    if job.status != ExportJobStatus.DONE:
+        raise HTTPException(status_code=409, detail="Экспорт еще не готов")
+    
+    return FileResponse(
+        job.file_path,
+        media_type=EXPORT_FORMATS[job.export_format],
+        filename=job.filename
+    )
@@ -1,47 +1,28 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 import httpx
 from app.config import settings
+from app.maps.geocoder import CachedGeocoder, GeocodingError, get_geocoder
 
 router = APIRouter()
 
 
 @router.get("/geocode")
-async def geocode_address(address: str):
-    """Geocode address using Yandex Maps API"""
+async def geocode_address(address: str, geocoder: CachedGeocoder = Depends(get_geocoder)):
+    """Geocode address using Yandex Maps API (cached)"""
     
-    if not settings.yandex_maps_api_key:
-        raise HTTPException(status_code=500, detail="Yandex Maps API key not configured")
+    try:
+        point = await geocoder.geocode(address)
+    except GeocodingError as e:
+        raise HTTPException(status_code=500, detail=str(e))
     
-    url = "https://geocode-maps.yandex.ru/1.x/"
-    params = {
-        "apikey": settings.yandex_maps_api_key,
-        "geocode": address,
-        "format": "json",
-        "results": 1
-    }
+    if point is None:
+        raise HTTPException(status_code=404, detail="Address not found")
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract coordinates from response
-            if "response" in data and "GeoObjectCollection" in data["response"]:
-                geo_objects = data["response"]["GeoObjectCollection"]["featureMember"]
-                if geo_objects:
-                    pos = geo_objects[0]["GeoObject"]["Point"]["pos"]
-                    lon, lat = map(float, pos.split())
-                    return {
-                        "latitude": lat,
-                        "longitude": lon,
-                        "address": address
-                    }
-            
-            raise HTTPException(status_code=404, detail="Address not found")
-            
-        except httpx.HTTPError:
-            raise HTTPException(status_code=500, detail="Geocoding service unavailable")
+    return {
+        "latitude": point["latitude"],
+        "longitude": point["longitude"],
+        "address": address
+    }
 
 
 @router.get("/static-map")
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Header, HTTPException, Request
+import hmac
+
+from app.config import settings
+from app.bot.webhook import webhook_processor, QueueFullError
+
+router = APIRouter()
+
+
+@router.post("/webhook")
+async def telegram_webhook(
+    request: Request,
+    x_telegram_bot_api_secret_token: str = Header(default="")
+):
+    """Receive Telegram update and queue it for the dispatcher"""
+    if not settings.telegram_webhook_secret or not hmac.compare_digest(
+        x_telegram_bot_api_secret_token.encode(), settings.telegram_webhook_secret.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Неверный секретный токен")
+    
+    if not webhook_processor.is_running:
+        raise HTTPException(status_code=503, detail="Бот не запущен в режиме webhook")
+    
+    try:
+        update = webhook_processor.enqueue(await request.json())
+    except ValueError:
+        # Invalid JSON or update schema
+        raise HTTPException(status_code=400, detail="Некорректное обновление")
+    except QueueFullError:
+        # Telegram retries the update later
+        raise HTTPException(status_code=503, detail="Очередь обновлений переполнена")
+    
+    return {"ok": True, "update_id": update.update_id}
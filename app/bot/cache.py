@@ -0,0 +1,78 @@
+from typing import Any, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.config import settings
+from app.database.models import User
+from app.utils.cache import TTLCache, MISSING
+from app.utils.metrics import metrics
+
+
+class UserSnapshot:
+    """Compact read-only copy of user columns, detached from any session"""
+    
+    __slots__ = tuple(column.key for column in User.__table__.columns)
+    
+    def __init__(self, **values: Any):
+        for key in self.__slots__:
+            object.__setattr__(self, key, values.get(key))
+    
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(**{key: getattr(user, key) for key in cls.__slots__})
+    
+    def __setattr__(self, key: str, value: Any):
+        raise AttributeError("UserSnapshot is read-only")
+    
+    def __repr__(self) -> str:
+        return f"<UserSnapshot id={self.id} telegram_id={self.telegram_id}>"
+
+
+# Users by telegram_id, None for unregistered users
+user_cache = TTLCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl)
+metrics.register("user_cache", user_cache.stats)
+
+
+def get_cached_user(telegram_id: int) -> Any:
+    """Cached user snapshot, None for unregistered user or MISSING"""
+    return user_cache.get(telegram_id, MISSING)
+
+
+def cache_user(telegram_id: int, user: Optional[User]) -> Optional[UserSnapshot]:
+    """Store user snapshot (or None for unregistered user) in cache"""
+    snapshot = UserSnapshot.from_user(user) if user else None
+    user_cache.set(telegram_id, snapshot)
+    return snapshot
+
+
+def invalidate_user(telegram_id: int):
+    """Drop cached user, call after bulk updates that bypass the ORM"""
+    user_cache.invalidate(telegram_id)
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_written_user(mapper, connection, target: User):
+    history = inspect(target).attrs.telegram_id.history
+    telegram_ids = {target.telegram_id, *history.deleted}
+    for telegram_id in telegram_ids:
+        invalidate_user(telegram_id)
+    
+    # Readers between flush and commit may re-cache the old row, drop it again after commit
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("written_telegram_ids", set()).update(telegram_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session):
+    for telegram_id in session.info.pop("written_telegram_ids", ()):
+        invalidate_user(telegram_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back_users(session: Session, previous_transaction):
+    for telegram_id in session.info.pop("written_telegram_ids", ()):
+        invalidate_user(telegram_id)
@@ -1,10 +1,11 @@
-from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery
+from aiogram import Router, F, Bot
+from aiogram.types import Message, CallbackQuery, FSInputFile
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.bot.keyboards.main import admin_menu_keyboard, back_keyboard
 from app.database.models import User
+from app.reports.jobs import export_jobs, ExportJob, ExportJobStatus
 
 router = Router()
 
@@ -62,10 +63,29 @@ async def upload_data(
     )
 
 
+def report_sender(bot: Bot, chat_id: int, title: str):
+    """Callback delivering finished export file to admin chat"""
+    async def send_report(job: ExportJob):
+        if job.status == ExportJobStatus.DONE:
+            await bot.send_document(
+                chat_id,
+                FSInputFile(job.file_path, filename=job.filename),
+                caption=f"{title}\n\nСтрок в отчете: {job.rows}"
+            )
+        else:
+            await bot.send_message(
+                chat_id,
+                f"{title}\n\n❌ Не удалось сформировать отчет."
+            )
+    
+    return send_report
+
+
 @router.message(F.text == "📊 Отчет по пользователям")
 async def export_users(
     message: Message,
     session: AsyncSession,
+    user: User,
     is_admin: bool
 ):
     """Export users report"""
@@ -75,10 +95,14 @@ async def export_users(
         )
         return
     
-    # TODO: Implement users export
+    await export_jobs.submit(
+        "users",
+        admin_phone=user.phone_number,
+        callback=report_sender(message.bot, message.chat.id, "📊 <b>Отчет по пользователям</b>")
+    )
     await message.answer(
         "📊 <b>Отчет по пользователям</b>\n\n"
-        "⚠️ Функция в разработке...",
+        "⏳ Отчет формируется, файл придет отдельным сообщением.",
         reply_markup=back_keyboard()
     )
 
@@ -87,6 +111,7 @@ async def export_users(
 async def export_events(
     message: Message,
     session: AsyncSession,
+    user: User,
     is_admin: bool
 ):
     """Export events report"""
@@ -96,9 +121,13 @@ async def export_events(
         )
         return
     
-    # TODO: Implement events export
+    await export_jobs.submit(
+        "events",
+        admin_phone=user.phone_number,
+        callback=report_sender(message.bot, message.chat.id, "📈 <b>Отчет по мероприятиям</b>")
+    )
     await message.answer(
         "📈 <b>Отчет по мероприятиям</b>\n\n"
-        "⚠️ Функция в разработке...",
+        "⏳ Отчет формируется, файл придет отдельным сообщением.",
         reply_markup=back_keyboard()
     )
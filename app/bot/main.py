@@ -1,15 +1,21 @@
 import asyncio
 import logging
+import os
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.fsm.storage.base import BaseStorage
 
 from app.config import settings
 from app.database.connection import init_database, close_database
 from app.bot.handlers import start, profile, events, friends, admin
 from app.bot.middlewares.auth import AuthMiddleware
 from app.bot.middlewares.database import DatabaseMiddleware
+from app.bot.middlewares.scheduler import SchedulerMiddleware
+from app.bot.storage import create_storage
+from app.rasa.integration import rasa_integration
+from app.reports.jobs import export_jobs
+from app.utils.metrics import metrics
 
 # Configure logging
 logging.basicConfig(
@@ -19,21 +25,23 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def main():
-    """Main bot function"""
-    
-    # Initialize database
-    await init_database()
-    logger.info("Database initialized")
-    
-    # Create bot and dispatcher
-    bot = Bot(
+def create_bot() -> Bot:
+    """Create bot with default properties"""
+    return Bot(
         token=settings.telegram_bot_token,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
+
+
+def create_dispatcher(storage: BaseStorage = None) -> Dispatcher:
+    """Create dispatcher with middlewares and routers"""
+    dp = Dispatcher(storage=storage or create_storage())
+    logger.info(f"FSM storage: {settings.fsm_storage}")
     
-    storage = MemoryStorage()
-    dp = Dispatcher(storage=storage)
+    # Handle updates concurrently, in order per user
+    scheduler = SchedulerMiddleware()
+    dp.update.outer_middleware(scheduler)
+    metrics.register("scheduler", scheduler.stats)
     
     # Add middlewares
     dp.message.middleware(DatabaseMiddleware())
@@ -48,10 +56,37 @@ async def main():
     dp.include_router(friends.router)
     dp.include_router(admin.router)
     
+    # Rasa HTTP client lives as long as the dispatcher (polling or webhook)
+    dp.shutdown.register(rasa_integration.close)
+    
+    return dp
+
+
+async def main():
+    """Main bot function (long polling)"""
+    
+    # Initialize database
+    await init_database()
+    logger.info("Database initialized")
+    
+    # Create bot and dispatcher
+    bot = create_bot()
+    dp = create_dispatcher()
+    
+    # Publish user cache and session counters for GET /metrics of the API process
+    metrics_task = asyncio.create_task(metrics.publish_periodically(
+        os.path.join(settings.metrics_dir, "bot.json"), settings.metrics_publish_interval
+    ))
+    
     try:
         logger.info("Starting bot...")
+        # Polling does not work while a webhook is registered
+        await bot.delete_webhook()
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
+        metrics_task.cancel()
+        await dp.storage.close()
+        await export_jobs.stop()
         await close_database()
         logger.info("Bot stopped")
 
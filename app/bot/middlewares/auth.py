@@ -6,6 +6,8 @@ from sqlalchemy import select
 
 from app.database.models import User
 from app.config import settings
+from app.bot.cache import get_cached_user, cache_user
+from app.utils.cache import MISSING
 
 
 class AuthMiddleware(BaseMiddleware):
@@ -22,11 +24,14 @@ class AuthMiddleware(BaseMiddleware):
         if not session:
             return await handler(event, data)
         
-        # Get user from database
-        result = await session.execute(
-            select(User).where(User.telegram_id == event.from_user.id)
-        )
-        user = result.scalar_one_or_none()
+        # Get user from cache or database (handlers get a read-only snapshot,
+        # load User by id from the session to modify it)
+        user = get_cached_user(event.from_user.id)
+        if user is MISSING:
+            result = await session.execute(
+                select(User).where(User.telegram_id == event.from_user.id)
+            )
+            user = cache_user(event.from_user.id, result.scalar_one_or_none())
         
         # Add user data to context
         data["user"] = user
@@ -1,13 +1,56 @@
-from typing import Callable, Dict, Any, Awaitable
+from typing import Callable, Dict, Any, Awaitable, Optional
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.connection import AsyncSessionLocal
+from app.utils.metrics import metrics
+
+QUERY_COUNT_BUCKETS = [0, 1, 2, 3, 5, 10, 20, 50]
+
+
+class LazySession:
+    """AsyncSession proxy that checks out a session on first use"""
+    
+    def __init__(self, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
+        self._session_factory = session_factory
+        self._session: Optional[AsyncSession] = None
+        self.sessions_opened = 0
+        self.queries = 0
+    
+    @property
+    def is_active(self) -> bool:
+        """Whether underlying session was created"""
+        return self._session is not None
+    
+    def _get_session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_factory()
+            self.sessions_opened += 1
+            event.listen(self._session.sync_session, "do_orm_execute", self._count_query)
+        return self._session
+    
+    def _count_query(self, orm_execute_state):
+        self.queries += 1
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get_session(), name)
+    
+    async def rollback(self):
+        if self._session is not None:
+            await self._session.rollback()
+    
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
 
 
 class DatabaseMiddleware(BaseMiddleware):
-    """Middleware to provide database session"""
+    """Middleware to provide lazily opened database session"""
+    
+    def __init__(self, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
+        self.session_factory = session_factory
     
     async def __call__(
         self,
@@ -15,12 +58,23 @@ class DatabaseMiddleware(BaseMiddleware):
         event: Message | CallbackQuery,
         data: Dict[str, Any]
     ) -> Any:
-        async with AsyncSessionLocal() as session:
-            data["session"] = session
-            try:
-                return await handler(event, data)
-            except Exception as e:
-                await session.rollback()
-                raise e
-            finally:
-                await session.close()
+        session = LazySession(self.session_factory)
+        data["session"] = session
+        try:
+            return await handler(event, data)
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
+            self.record(session)
+    
+    @staticmethod
+    def record(session: LazySession):
+        """Record per-update session and query usage"""
+        metrics.inc("bot_updates_total")
+        metrics.inc("bot_db_sessions_total", session.sessions_opened)
+        metrics.inc("bot_db_queries_total", session.queries)
+        metrics.observe("bot_db_queries_per_update", session.queries, buckets=QUERY_COUNT_BUCKETS)
+        if not session.is_active:
+            metrics.inc("bot_updates_without_db_total")
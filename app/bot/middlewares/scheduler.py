@@ -0,0 +1,79 @@
+import asyncio
+import contextlib
+import time
+from typing import Callable, Dict, Any, Awaitable, Optional
+from aiogram import BaseMiddleware
+from aiogram.types import Update, User
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+
+class SchedulerMiddleware(BaseMiddleware):
+    """Limit concurrently handled updates, keeping updates of one user in order
+    
+    Registered as outer update middleware, so it runs before routers and FSM.
+    A user's FIFO lock is taken before a global slot, so queued updates of a
+    busy user do not hold slots needed by other users.
+    """
+    
+    def __init__(self, max_concurrent: int = None):
+        self.max_concurrent = max_concurrent or settings.bot_max_concurrent_updates
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._pending: Dict[int, int] = {}
+        self.waiting = 0
+        self.active = 0
+    
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        received = time.perf_counter()
+        user: Optional[User] = data.get("event_from_user")
+        
+        self.waiting += 1
+        metrics.set("bot_updates_queued", self.waiting)
+        started = False
+        try:
+            # Lock is requested before the first await to keep arrival order
+            async with self._user_lock(user.id if user else None), self._slots:
+                started = True
+                self.waiting -= 1
+                self.active += 1
+                metrics.observe("bot_update_wait_seconds", time.perf_counter() - received)
+                try:
+                    return await handler(event, data)
+                finally:
+                    self.active -= 1
+        finally:
+            if not started:
+                self.waiting -= 1
+            metrics.set("bot_updates_queued", self.waiting)
+    
+    @contextlib.asynccontextmanager
+    async def _user_lock(self, user_id: Optional[int]):
+        if user_id is None:
+            yield
+            return
+        
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        self._pending[user_id] = self._pending.get(user_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._pending[user_id] -= 1
+            if not self._pending[user_id]:
+                del self._pending[user_id]
+                del self._locks[user_id]
+    
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self.active,
+            "queued": self.waiting,
+            "users_waiting": sum(1 for pending in self._pending.values() if pending > 1)
+        }
@@ -0,0 +1,183 @@
+import json
+import time
+from typing import Any, Dict, Optional
+
+import aiosqlite
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage, MemoryStorageRecord
+
+from app.config import settings
+
+PURGE_EVERY = 100  # writes between expired records cleanup
+
+
+def build_key(prefix: str, key: StorageKey) -> str:
+    """Storage key string with prefix, bot, chat, thread, user and destiny"""
+    return ":".join([
+        prefix,
+        str(key.bot_id),
+        str(key.chat_id),
+        str(key.thread_id or 0),
+        str(key.user_id),
+        key.destiny
+    ])
+
+
+class ExpiringMemoryStorage(MemoryStorage):
+    """Memory storage dropping records not touched for state TTL"""
+    
+    def __init__(self, state_ttl: int = None):
+        super().__init__()
+        self.state_ttl = state_ttl
+        self.touched: Dict[StorageKey, float] = {}
+        self._writes = 0
+    
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await super().set_state(key, state)
+        self._touch(key)
+    
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = self._get_record(key)
+        return record.state if record else None
+    
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        await super().set_data(key, data)
+        self._touch(key)
+    
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = self._get_record(key)
+        return record.data.copy() if record else {}
+    
+    def _get_record(self, key: StorageKey) -> Optional[MemoryStorageRecord]:
+        # Do not create empty records on reads like defaultdict would
+        record = self.storage.get(key)
+        if record and self._is_expired(key):
+            self._drop(key)
+            return None
+        return record
+    
+    def _touch(self, key: StorageKey):
+        record = self.storage[key]
+        if record.state is None and not record.data:
+            self._drop(key)
+        else:
+            self.touched[key] = time.monotonic()
+        
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            self.purge()
+    
+    def _is_expired(self, key: StorageKey) -> bool:
+        return bool(self.state_ttl) and time.monotonic() - self.touched.get(key, 0) > self.state_ttl
+    
+    def _drop(self, key: StorageKey):
+        self.storage.pop(key, None)
+        self.touched.pop(key, None)
+    
+    def purge(self):
+        """Remove expired records"""
+        for key in [key for key in self.storage if self._is_expired(key)]:
+            self._drop(key)
+
+
+class SQLiteStorage(BaseStorage):
+    """FSM storage in a local SQLite file, shared by bot processes on one host"""
+    
+    def __init__(self, path: str, state_ttl: int = None, prefix: str = "fsm"):
+        self.path = path
+        self.state_ttl = state_ttl
+        self.prefix = prefix
+        self._connection: Optional[aiosqlite.Connection] = None
+        self._writes = 0
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        if self._connection is None:
+            self._connection = await aiosqlite.connect(self.path)
+            await self._connection.execute("PRAGMA journal_mode=WAL")
+            await self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fsm_storage ("
+                "key TEXT PRIMARY KEY, state TEXT, data TEXT, expires_at REAL)"
+            )
+            await self._connection.commit()
+        return self._connection
+    
+    def _expires_at(self) -> Optional[float]:
+        return time.time() + self.state_ttl if self.state_ttl else None
+    
+    async def _get(self, key: StorageKey, column: str) -> Optional[str]:
+        connection = await self._connect()
+        async with connection.execute(
+            f"SELECT {column} FROM fsm_storage WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (build_key(self.prefix, key), time.time())
+        ) as cursor:
+            row = await cursor.fetchone()
+        return row[0] if row else None
+    
+    async def _set(self, key: StorageKey, column: str, value: Optional[str]):
+        connection = await self._connect()
+        await connection.execute(
+            f"INSERT INTO fsm_storage (key, {column}, expires_at) VALUES (?, ?, ?) "
+            f"ON CONFLICT(key) DO UPDATE SET {column} = excluded.{column}, expires_at = excluded.expires_at",
+            (build_key(self.prefix, key), value, self._expires_at())
+        )
+        
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            await self.purge(commit=False)
+        await connection.commit()
+    
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self._set(key, "state", state.state if isinstance(state, State) else state)
+    
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return await self._get(key, "state")
+    
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        await self._set(key, "data", json.dumps(data) if data else None)
+    
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        data = await self._get(key, "data")
+        return json.loads(data) if data else {}
+    
+    async def purge(self, commit: bool = True):
+        """Remove expired and empty records"""
+        connection = await self._connect()
+        await connection.execute(
+            "DELETE FROM fsm_storage WHERE expires_at <= ? OR (state IS NULL AND data IS NULL)",
+            (time.time(),)
+        )
+        if commit:
+            await connection.commit()
+    
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+def create_storage(backend: str = None) -> BaseStorage:
+    """Create FSM storage for configured backend: memory, redis or sqlite"""
+    backend = backend or settings.fsm_storage
+    state_ttl = settings.fsm_state_ttl or None
+    
+    if backend == "memory":
+        return ExpiringMemoryStorage(state_ttl=state_ttl)
+    
+    if backend == "redis":
+        try:
+            from aiogram.fsm.storage.redis import RedisStorage, DefaultKeyBuilder
+        except ImportError:
+            raise RuntimeError("Redis FSM storage requires redis package: pip install redis")
+        
+        return RedisStorage.from_url(
+            settings.redis_url,
+            key_builder=DefaultKeyBuilder(prefix=settings.fsm_key_prefix, with_bot_id=True, with_destiny=True),
+            state_ttl=state_ttl,
+            data_ttl=state_ttl
+        )
+    
+    if backend == "sqlite":
+        return SQLiteStorage(settings.fsm_sqlite_path, state_ttl=state_ttl, prefix=settings.fsm_key_prefix)
+    
+    raise ValueError(f"Unknown FSM storage backend: {backend}")
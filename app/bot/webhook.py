@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when webhook update queue is full"""
+
+
+class WebhookProcessor:
+    """Feed webhook updates into the dispatcher through a bounded queue"""
+    
+    def __init__(self, queue_size: int = None, workers: int = None):
+        self.queue_size = queue_size or settings.webhook_queue_size
+        self.workers = workers or settings.webhook_workers
+        self.bot: Optional[Bot] = None
+        self.dp: Optional[Dispatcher] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+    
+    @property
+    def is_running(self) -> bool:
+        return bool(self._tasks)
+    
+    async def start(self, bot: Bot, dp: Dispatcher, set_webhook: bool = True):
+        """Start workers and register webhook URL at Telegram"""
+        self.bot = bot
+        self.dp = dp
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"webhook-worker-{i}")
+            for i in range(self.workers)
+        ]
+        metrics.register("webhook", self.stats)
+        await dp.emit_startup(bot=bot, dispatcher=dp)
+        
+        if set_webhook and settings.telegram_webhook_url:
+            await bot.set_webhook(
+                settings.telegram_webhook_url,
+                secret_token=settings.telegram_webhook_secret,
+                allowed_updates=dp.resolve_used_update_types(),
+                max_connections=min(self.workers, 100)
+            )
+            logger.info(f"Webhook set to {settings.telegram_webhook_url}")
+    
+    async def stop(self, timeout: float = 10.0):
+        """Process queued updates and stop workers"""
+        if not self._tasks:
+            return
+        
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropping {self._queue.qsize()} queued updates on shutdown")
+        
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        
+        await self.dp.emit_shutdown(bot=self.bot, dispatcher=self.dp)
+        await self.dp.storage.close()
+        await self.bot.session.close()
+    
+    def enqueue(self, data: Dict[str, Any]) -> Update:
+        """Validate raw update and put it in the queue"""
+        update = Update.model_validate(data, context={"bot": self.bot})
+        try:
+            self._queue.put_nowait((update, time.perf_counter()))
+        except asyncio.QueueFull:
+            metrics.inc("webhook_updates_rejected_total")
+            raise QueueFullError()
+        
+        metrics.inc("webhook_updates_received_total")
+        return update
+    
+    async def _worker(self):
+        while True:
+            update, received = await self._queue.get()
+            try:
+                await self.dp.feed_update(self.bot, update)
+            except Exception as e:
+                logger.error(f"Update {update.update_id} failed: {e}")
+                metrics.inc("webhook_updates_failed_total")
+            finally:
+                metrics.observe("webhook_update_seconds", time.perf_counter() - received)
+                self._queue.task_done()
+    
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            "workers": self.workers
+        }
+
+
+# Global instance
+webhook_processor = WebhookProcessor()
@@ -18,12 +18,24 @@ class Settings(BaseSettings):
     
     # Yandex Maps
     yandex_maps_api_key: str = Field(default="", env="YANDEX_MAPS_API_KEY")
+    maps_cache_backend: str = Field(default="sqlite", env="MAPS_CACHE_BACKEND")  # sqlite, redis or memory
+    maps_cache_path: str = Field(default="./maps_cache.db", env="MAPS_CACHE_PATH")
+    geocode_cache_size: int = Field(default=10000, env="GEOCODE_CACHE_SIZE")
+    geocode_cache_ttl: float = Field(default=2592000.0, env="GEOCODE_CACHE_TTL")  # 30 days
+    geocode_negative_ttl: float = Field(default=3600.0, env="GEOCODE_NEGATIVE_TTL")  # seconds
     
     # File Storage
     uploads_dir: str = Field(default="./app/static/uploads", env="UPLOADS_DIR")
     photos_dir: str = Field(default="./app/static/photos", env="PHOTOS_DIR")
     max_file_size: int = Field(default=10485760, env="MAX_FILE_SIZE")  # 10MB
     
+    # Reports
+    export_chunk_size: int = Field(default=1000, env="EXPORT_CHUNK_SIZE")
+    export_spool_size: int = Field(default=1048576, env="EXPORT_SPOOL_SIZE")  # 1MB
+    export_workers: int = Field(default=2, env="EXPORT_WORKERS")
+    export_cache_ttl: int = Field(default=3600, env="EXPORT_CACHE_TTL")  # seconds
+    exports_dir: str = Field(default="./exports", env="EXPORTS_DIR")  # not served as static
+    
     # Admin
     admin_phones: str = Field(default="", env="ADMIN_PHONES")
     
@@ -33,12 +45,56 @@ class Settings(BaseSettings):
             return []
         return [phone.strip() for phone in self.admin_phones.split(",") if phone.strip()]
     
+    # Bot
+    bot_max_concurrent_updates: int = Field(default=32, env="BOT_MAX_CONCURRENT_UPDATES")
+    user_cache_size: int = Field(default=10000, env="USER_CACHE_SIZE")
+    user_cache_ttl: float = Field(default=60.0, env="USER_CACHE_TTL")  # seconds
+    fsm_storage: str = Field(default="memory", env="FSM_STORAGE")  # memory, redis or sqlite
+    fsm_state_ttl: int = Field(default=86400, env="FSM_STATE_TTL")  # seconds, 0 keeps forever
+    fsm_key_prefix: str = Field(default="fsm", env="FSM_KEY_PREFIX")
+    fsm_sqlite_path: str = Field(default="./fsm_storage.db", env="FSM_SQLITE_PATH")
+    bot_mode: str = Field(default="polling", env="BOT_MODE")  # polling or webhook
+    telegram_webhook_url: str = Field(default="", env="TELEGRAM_WEBHOOK_URL")
+    telegram_webhook_secret: str = Field(default="", env="TELEGRAM_WEBHOOK_SECRET")
+    webhook_queue_size: int = Field(default=1000, env="WEBHOOK_QUEUE_SIZE")
+    webhook_workers: int = Field(default=16, env="WEBHOOK_WORKERS")
+    
     # Rasa
     rasa_server_url: str = Field(default="http://localhost:5005", env="RASA_SERVER_URL")
+    rasa_max_connections: int = Field(default=50, env="RASA_MAX_CONNECTIONS")
+    rasa_max_keepalive: int = Field(default=20, env="RASA_MAX_KEEPALIVE")
+    rasa_keepalive_expiry: float = Field(default=30.0, env="RASA_KEEPALIVE_EXPIRY")  # seconds
+    rasa_connect_timeout: float = Field(default=2.0, env="RASA_CONNECT_TIMEOUT")  # seconds
+    rasa_read_timeout: float = Field(default=10.0, env="RASA_READ_TIMEOUT")  # seconds
+    rasa_http2: bool = Field(default=False, env="RASA_HTTP2")  # requires httpx[http2]
+    rasa_health_ttl: float = Field(default=5.0, env="RASA_HEALTH_TTL")  # seconds
+    rasa_health_timeout: float = Field(default=2.0, env="RASA_HEALTH_TIMEOUT")  # seconds
+    rasa_failure_threshold: int = Field(default=3, env="RASA_FAILURE_THRESHOLD")
+    rasa_reset_timeout: float = Field(default=30.0, env="RASA_RESET_TIMEOUT")  # seconds
+    rasa_probe_interval: float = Field(default=10.0, env="RASA_PROBE_INTERVAL")  # seconds
+    rasa_intent_cache_size: int = Field(default=5000, env="RASA_INTENT_CACHE_SIZE")
+    rasa_intent_cache_ttl: float = Field(default=600.0, env="RASA_INTENT_CACHE_TTL")  # seconds
+    rasa_static_intents: str = Field(default="", env="RASA_STATIC_INTENTS")  # comma separated
+    rasa_local_classifier: bool = Field(default=True, env="RASA_LOCAL_CLASSIFIER")
+    rasa_nlu_path: str = Field(default="./data/nlu.yml", env="RASA_NLU_PATH")
+    rasa_local_min_confidence: float = Field(default=0.6, env="RASA_LOCAL_MIN_CONFIDENCE")
+    rasa_local_min_margin: float = Field(default=0.2, env="RASA_LOCAL_MIN_MARGIN")
+    rasa_parse_concurrency: int = Field(default=8, env="RASA_PARSE_CONCURRENCY")
+    rasa_parse_retries: int = Field(default=2, env="RASA_PARSE_RETRIES")
+    
+    # Rasa action server
+    actions_database_url: str = Field(default="", env="ACTIONS_DATABASE_URL")  # defaults to DATABASE_URL
+    actions_db_pool_size: int = Field(default=5, env="ACTIONS_DB_POOL_SIZE")
+    actions_db_max_overflow: int = Field(default=10, env="ACTIONS_DB_MAX_OVERFLOW")
+    actions_db_busy_timeout: int = Field(default=5000, env="ACTIONS_DB_BUSY_TIMEOUT")  # ms, SQLite only
     
     # Redis
     redis_url: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
     
+    # Metrics
+    metrics_dir: str = Field(default="./metrics", env="METRICS_DIR")
+    metrics_publish_interval: float = Field(default=15.0, env="METRICS_PUBLISH_INTERVAL")  # seconds
+    
     # Environment
     environment: str = Field(default="development", env="ENVIRONMENT")
     debug: bool = Field(default=True, env="DEBUG")
@@ -0,0 +1,45 @@
+from typing import Any, Dict, List
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.version import bump_table_versions
+
+INSERT_BATCH_SIZE = 500
+
+DIALECT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+async def insert_ignore(
+    session: AsyncSession,
+    model,
+    rows: List[Dict[str, Any]],
+    index_elements: List[str],
+    batch_size: int = INSERT_BATCH_SIZE
+) -> int:
+    """Bulk INSERT ... ON CONFLICT DO NOTHING, return number of inserted rows"""
+    dialect = session.bind.dialect.name
+    if dialect not in DIALECT_INSERTS:
+        raise NotImplementedError(f"Bulk insert is not supported for {dialect}")
+    
+    insert = DIALECT_INSERTS[dialect]
+    inserted = 0
+    for start in range(0, len(rows), batch_size):
+        statement = (
+            insert(model)
+            .values(rows[start:start + batch_size])
+            .on_conflict_do_nothing(index_elements=index_elements)
+        )
+        result = await session.execute(statement)
+        inserted += result.rowcount
+    
+    if inserted:
+        # Core inserts bypass ORM flush events
+        await session.run_sync(
+            lambda sync_session: bump_table_versions(sync_session.connection(), [model.__tablename__])
+        )
+    
+    return inserted
@@ -2,7 +2,8 @@ from .base import Base
 from .user import User, Interest, Region, UserInterest
 from .event import Event, EventInterest, EventParticipant
 from .friendship import Friendship
-from .admin import AdminAction
+from .admin import AdminAction, AdminActionType
+from .version import TableVersion
 
 __all__ = [
     "Base",
@@ -14,5 +15,7 @@ __all__ = [
     "EventInterest",
     "EventParticipant",
     "Friendship",
-    "AdminAction"
+    "AdminAction",
+    "AdminActionType",
+    "TableVersion"
 ]
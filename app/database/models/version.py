@@ -0,0 +1,40 @@
+from itertools import chain
+
+from sqlalchemy import Column, Integer, String, event, update, insert
+from sqlalchemy.orm import Session
+from .base import Base
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+    
+    table_name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+def bump_table_versions(connection, table_names):
+    """Increment change counters of tables, within the caller's transaction"""
+    for table_name in sorted(table_names):
+        result = connection.execute(
+            update(TableVersion)
+            .where(TableVersion.table_name == table_name)
+            .values(version=TableVersion.version + 1)
+        )
+        if not result.rowcount:
+            connection.execute(insert(TableVersion).values(table_name=table_name, version=1))
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_tables(session, flush_context):
+    # Committed together with the flushed rows, so other processes see it too
+    changed = chain(
+        session.new,
+        session.deleted,
+        (obj for obj in session.dirty if session.is_modified(obj, include_collections=False))
+    )
+    table_names = {
+        obj.__table__.name for obj in changed
+        if getattr(obj, "__table__", None) is not None and obj.__table__.name != TableVersion.__tablename__
+    }
+    if table_names:
+        bump_table_versions(session.connection(), table_names)
@@ -0,0 +1 @@
+# Yandex Maps integration
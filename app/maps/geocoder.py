@@ -0,0 +1,124 @@
+import logging
+import re
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import settings
+from app.maps.store import create_cache_store
+from app.utils.cache import TTLCache, MISSING
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+GEOCODE_URL = "https://geocode-maps.yandex.ru/1.x/"
+
+
+class GeocodingError(Exception):
+    """Geocoder is not configured or upstream failed"""
+
+
+def normalize_address(address: str) -> str:
+    """Cache key form of an address: lowercase, single spaces, no trailing punctuation"""
+    address = address.lower().replace("ё", "е")
+    address = re.sub(r"\s*,\s*", ", ", address)
+    return " ".join(address.split()).strip(" ,.;")
+
+
+class YandexGeocoder:
+    """Yandex geocoder HTTP API"""
+    
+    async def geocode(self, address: str) -> Optional[Dict[str, float]]:
+        """Coordinates of an address, None when nothing is found"""
+        if not settings.yandex_maps_api_key:
+            raise GeocodingError("Yandex Maps API key not configured")
+        
+        params = {
+            "apikey": settings.yandex_maps_api_key,
+            "geocode": address,
+            "format": "json",
+            "results": 1
+        }
+        
+        async with httpx.AsyncClient() as client:
+            try:
+                response = await client.get(GEOCODE_URL, params=params)
+                response.raise_for_status()
+                data = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                raise GeocodingError("Geocoding service unavailable") from e
+        
+        geo_objects = data.get("response", {}).get("GeoObjectCollection", {}).get("featureMember", [])
+        if not geo_objects:
+            return None
+        
+        lon, lat = map(float, geo_objects[0]["GeoObject"]["Point"]["pos"].split())
+        return {"latitude": lat, "longitude": lon}
+
+
+class StubGeocoder:
+    """Offline geocoder answering from a dict, for tests and local development"""
+    
+    def __init__(self, addresses: Dict[str, Dict[str, float]] = None):
+        self.addresses = {normalize_address(address): point for address, point in (addresses or {}).items()}
+        self.calls = 0
+    
+    async def geocode(self, address: str) -> Optional[Dict[str, float]]:
+        self.calls += 1
+        return self.addresses.get(normalize_address(address))
+
+
+class CachedGeocoder:
+    """Geocoder with in-process LRU and persistent cache tiers
+    
+    "Not found" answers are cached too, for a shorter negative TTL.
+    Upstream errors are never cached.
+    """
+    
+    def __init__(self, geocoder=None, store=None, maxsize: int = None, ttl: float = None, negative_ttl: float = None):
+        self.geocoder = geocoder or YandexGeocoder()
+        self.store = store if store is not None else create_cache_store("geocode")
+        self.ttl = ttl or settings.geocode_cache_ttl
+        self.negative_ttl = negative_ttl or settings.geocode_negative_ttl
+        self.memory = TTLCache(maxsize or settings.geocode_cache_size, self.ttl)
+        self.store_hits = 0
+        self.upstream_calls = 0
+    
+    async def geocode(self, address: str) -> Optional[Dict[str, float]]:
+        key = normalize_address(address)
+        
+        point = self.memory.get(key)
+        if point is not MISSING:
+            metrics.inc("geocode_cache_total", result="memory_hit")
+            return point
+        
+        point = await self.store.get(key)
+        if point is not MISSING:
+            metrics.inc("geocode_cache_total", result="store_hit")
+            self.store_hits += 1
+            self.memory.set(key, point, ttl=self.ttl if point else self.negative_ttl)
+            return point
+        
+        metrics.inc("geocode_cache_total", result="miss")
+        self.upstream_calls += 1
+        point = await self.geocoder.geocode(address)
+        ttl = self.ttl if point else self.negative_ttl
+        self.memory.set(key, point, ttl=ttl)
+        await self.store.set(key, point, ttl)
+        return point
+    
+    async def close(self):
+        await self.store.close()
+    
+    def stats(self) -> dict:
+        return {**self.memory.stats(), "store_hits": self.store_hits, "upstream_calls": self.upstream_calls}
+
+
+# Global instance
+geocoder = CachedGeocoder()
+metrics.register("geocode_cache", geocoder.stats)
+
+
+def get_geocoder() -> CachedGeocoder:
+    """FastAPI dependency, override with a stub geocoder in tests"""
+    return geocoder
@@ -0,0 +1,110 @@
+import json
+import time
+from typing import Any, Optional
+
+import aiosqlite
+
+from app.config import settings
+from app.utils.cache import MISSING
+
+PURGE_EVERY = 1000  # writes between expired records cleanup
+
+
+class SQLiteCacheStore:
+    """Persistent key-value cache in a local SQLite table, values stored as JSON"""
+    
+    def __init__(self, path: str, namespace: str):
+        self.path = path
+        self.namespace = namespace
+        self._connection: Optional[aiosqlite.Connection] = None
+        self._writes = 0
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        if self._connection is None:
+            self._connection = await aiosqlite.connect(self.path)
+            await self._connection.execute("PRAGMA journal_mode=WAL")
+            await self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS maps_cache ("
+                "namespace TEXT, key TEXT, value TEXT, expires_at REAL, PRIMARY KEY (namespace, key))"
+            )
+            await self._connection.commit()
+        return self._connection
+    
+    async def get(self, key: str) -> Any:
+        """Stored value or MISSING"""
+        connection = await self._connect()
+        async with connection.execute(
+            "SELECT value FROM maps_cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (self.namespace, key, time.time())
+        ) as cursor:
+            row = await cursor.fetchone()
+        return json.loads(row[0]) if row else MISSING
+    
+    async def set(self, key: str, value: Any, ttl: float):
+        connection = await self._connect()
+        await connection.execute(
+            "INSERT OR REPLACE INTO maps_cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (self.namespace, key, json.dumps(value), time.time() + ttl)
+        )
+        
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            await connection.execute("DELETE FROM maps_cache WHERE expires_at <= ?", (time.time(),))
+        await connection.commit()
+    
+    async def close(self):
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+class RedisCacheStore:
+    """Key-value cache in Redis shared by all API workers"""
+    
+    def __init__(self, url: str, namespace: str):
+        try:
+            from redis.asyncio import Redis
+        except ImportError:
+            raise RuntimeError("Redis maps cache requires redis package: pip install redis")
+        
+        self.redis = Redis.from_url(url)
+        self.prefix = f"maps:{namespace}:"
+    
+    async def get(self, key: str) -> Any:
+        value = await self.redis.get(self.prefix + key)
+        return json.loads(value) if value is not None else MISSING
+    
+    async def set(self, key: str, value: Any, ttl: float):
+        await self.redis.set(self.prefix + key, json.dumps(value), ex=max(int(ttl), 1))
+    
+    async def close(self):
+        await self.redis.aclose()
+
+
+class NullCacheStore:
+    """Store keeping nothing, for MAPS_CACHE_BACKEND=memory"""
+    
+    async def get(self, key: str) -> Any:
+        return MISSING
+    
+    async def set(self, key: str, value: Any, ttl: float):
+        pass
+    
+    async def close(self):
+        pass
+
+
+def create_cache_store(namespace: str, backend: str = None):
+    """Persistent cache tier for configured backend: sqlite, redis or memory"""
+    backend = backend or settings.maps_cache_backend
+    
+    if backend == "sqlite":
+        return SQLiteCacheStore(settings.maps_cache_path, namespace)
+    
+    if backend == "redis":
+        return RedisCacheStore(settings.redis_url, namespace)
+    
+    if backend == "memory":
+        return NullCacheStore()
+    
+    raise ValueError(f"Unknown maps cache backend: {backend}")
@@ -0,0 +1,135 @@
+import math
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+ENTITY_PATTERN = re.compile(r"\[([^\]]+)\](?:\([^)]*\)|\{[^}]*\})")
+
+
+def normalize_text(text: str) -> str:
+    """Cache key form of a message: lowercase words without punctuation"""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower().replace("ё", "е")).split())
+
+
+def load_nlu_examples(path: str) -> List[Tuple[str, str]]:
+    """(text, intent) pairs from Rasa NLU training data, entity markup removed"""
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    
+    examples = []
+    for item in data.get("nlu", []):
+        if "intent" not in item:
+            continue
+        for line in (item.get("examples") or "").splitlines():
+            line = line.strip()
+            if line.startswith("- "):
+                examples.append((ENTITY_PATTERN.sub(r"\1", line[2:]), item["intent"]))
+    return examples
+
+
+class IntentClassifier:
+    """Char n-gram TF-IDF nearest-centroid intent classifier
+    
+    Intent centroids are rows of a dense NumPy matrix over the n-gram
+    vocabulary, so a prediction is one gather and one small dot product.
+    Texts equal to a training example (after normalization) are answered
+    from a dict with full confidence.
+    """
+    
+    def __init__(self, ngram_range: Tuple[int, int] = (2, 4)):
+        self.ngram_range = ngram_range
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+        self.centroids: Optional[np.ndarray] = None
+        self.intents: List[str] = []
+        self.exact: Dict[str, str] = {}
+    
+    def ngrams(self, text: str) -> Dict[str, int]:
+        """Character n-gram counts inside word boundaries"""
+        counts: Dict[str, int] = defaultdict(int)
+        low, high = self.ngram_range
+        for word in normalize_text(text).split():
+            word = f" {word} "
+            for n in range(low, high + 1):
+                for i in range(len(word) - n + 1):
+                    counts[word[i:i + n]] += 1
+        return counts
+    
+    def fit(self, examples: Iterable[Tuple[str, str]]) -> "IntentClassifier":
+        """Build vocabulary, IDF weights and intent centroids"""
+        examples = list(examples)
+        documents = [(self.ngrams(text), intent) for text, intent in examples]
+        
+        # Texts listed under several intents are ambiguous, keep them out
+        labels: Dict[str, set] = defaultdict(set)
+        for text, intent in examples:
+            labels[normalize_text(text)].add(intent)
+        self.exact = {text: intents.pop() for text, intents in labels.items() if len(intents) == 1}
+        
+        document_frequency: Dict[str, int] = defaultdict(int)
+        for counts, _ in documents:
+            for ngram in counts:
+                document_frequency[ngram] += 1
+        
+        self.vocabulary = {ngram: i for i, ngram in enumerate(sorted(document_frequency))}
+        self.idf = np.array([
+            math.log((1 + len(documents)) / (1 + document_frequency[ngram])) + 1
+            for ngram in sorted(document_frequency)
+        ], dtype=np.float32)
+        self.intents = sorted({intent for _, intent in documents})
+        
+        index = {intent: i for i, intent in enumerate(self.intents)}
+        self.centroids = np.zeros((len(self.intents), len(self.vocabulary)), dtype=np.float32)
+        for counts, intent in documents:
+            columns, weights = self._weights(counts)
+            self.centroids[index[intent], columns] += weights
+        
+        norms = np.linalg.norm(self.centroids, axis=1, keepdims=True)
+        self.centroids /= np.where(norms > 0, norms, 1)
+        return self
+    
+    @classmethod
+    def from_nlu(cls, path: str, **kwargs) -> "IntentClassifier":
+        return cls(**kwargs).fit(load_nlu_examples(path))
+    
+    def _weights(self, counts: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Vocabulary columns and L2-normalized TF-IDF weights of known n-grams"""
+        columns = [self.vocabulary[ngram] for ngram in counts if ngram in self.vocabulary]
+        if not columns:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        
+        columns = np.array(columns, dtype=np.intp)
+        weights = np.array(
+            [count for ngram, count in counts.items() if ngram in self.vocabulary], dtype=np.float32
+        ) * self.idf[columns]
+        return columns, weights / np.linalg.norm(weights)
+    
+    def predict(self, text: str) -> Tuple[Optional[str], float, float]:
+        """Best intent with its cosine similarity and margin over the runner-up"""
+        if self.centroids is None or not self.intents:
+            return None, 0.0, 0.0
+        
+        intent = self.exact.get(normalize_text(text))
+        if intent is not None:
+            return intent, 1.0, 1.0
+        
+        columns, weights = self._weights(self.ngrams(text))
+        if not len(columns):
+            return None, 0.0, 0.0
+        
+        scores = self.centroids[:, columns] @ weights
+        if len(scores) == 1:
+            return self.intents[0], float(scores[0]), float(scores[0])
+        
+        second, best = np.argpartition(scores, -2)[-2:]
+        return self.intents[best], float(scores[best]), float(scores[best] - scores[second])
+    
+    def classify(self, text: str, min_confidence: float, min_margin: float) -> Optional[str]:
+        """Intent when prediction is confident enough, None for ambiguous text"""
+        intent, confidence, margin = self.predict(text)
+        if confidence >= min_confidence and margin >= min_margin:
+            return intent
+        return None
@@ -0,0 +1,143 @@
+import asyncio
+import enum
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class RasaHealth:
+    """Cached Rasa availability with a circuit breaker
+    
+    Results of /status probes are cached for ttl seconds. After
+    failure_threshold consecutive failures the circuit opens and callers
+    fail fast for reset_timeout seconds, then a single trial probe decides
+    whether it closes again. A background task keeps probing every
+    probe_interval seconds so recovery is noticed without user traffic.
+    """
+    
+    def __init__(
+        self,
+        probe: Callable[[], Awaitable[bool]],
+        ttl: float = None,
+        failure_threshold: int = None,
+        reset_timeout: float = None,
+        probe_interval: float = None,
+        timer: Callable[[], float] = time.monotonic
+    ):
+        self.probe = probe
+        self.ttl = ttl if ttl is not None else settings.rasa_health_ttl
+        self.failure_threshold = failure_threshold or settings.rasa_failure_threshold
+        self.reset_timeout = reset_timeout if reset_timeout is not None else settings.rasa_reset_timeout
+        self.probe_interval = probe_interval or settings.rasa_probe_interval
+        self.timer = timer
+        self.state = CircuitState.CLOSED
+        self.available = False
+        self.failures = 0
+        self.checked_at: Optional[float] = None
+        self.opened_at = 0.0
+        self._probing: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def is_available(self) -> bool:
+        """Whether Rasa can be called now, probing only when cache is stale"""
+        self.start()
+        now = self.timer()
+        
+        if self.state == CircuitState.OPEN:
+            if now - self.opened_at < self.reset_timeout:
+                metrics.inc("rasa_calls_rejected_total")
+                return False
+            self._transition(CircuitState.HALF_OPEN)
+        elif self.checked_at is not None and now - self.checked_at < self.ttl:
+            return self.available
+        
+        return await self.check()
+    
+    async def check(self) -> bool:
+        """Probe Rasa once, concurrent callers share the running probe"""
+        if self._probing is None or self._probing.done():
+            self._probing = asyncio.create_task(self._probe_once())
+        return await asyncio.shield(self._probing)
+    
+    async def _probe_once(self) -> bool:
+        try:
+            ok = await self.probe()
+        except Exception as e:
+            logger.warning(f"Rasa health probe failed: {e}")
+            ok = False
+        
+        if ok:
+            self.record_success()
+        else:
+            self.record_failure()
+        return ok
+    
+    def record_success(self):
+        """Register successful probe or request"""
+        self.checked_at = self.timer()
+        self.available = True
+        self.failures = 0
+        if self.state != CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+    
+    def record_failure(self):
+        """Register failed probe or request, opening circuit at threshold"""
+        self.checked_at = self.timer()
+        self.available = False
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or (
+            self.state == CircuitState.CLOSED and self.failures >= self.failure_threshold
+        ):
+            self.opened_at = self.checked_at
+            self._transition(CircuitState.OPEN)
+        elif self.state == CircuitState.OPEN:
+            self.opened_at = self.checked_at
+    
+    def _transition(self, state: CircuitState):
+        logger.info(f"Rasa circuit {self.state.value} -> {state.value}")
+        self.state = state
+        metrics.inc("rasa_circuit_transitions_total", state=state.value)
+        metrics.set("rasa_circuit_open", int(state == CircuitState.OPEN))
+    
+    def start(self):
+        """Start background probing on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._probe_periodically(), name="rasa-health")
+            metrics.register("rasa_health", self.stats)
+    
+    async def stop(self):
+        """Cancel background probing"""
+        for task in (self._task, self._probing):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._task = None
+        self._probing = None
+    
+    async def _probe_periodically(self):
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            if self.state == CircuitState.OPEN:
+                if self.timer() - self.opened_at < self.reset_timeout:
+                    continue
+                self._transition(CircuitState.HALF_OPEN)
+            await self.check()
+    
+    def stats(self) -> dict:
+        return {
+            "state": self.state.value,
+            "available": self.available,
+            "failures": self.failures,
+            "checked_ago": round(self.timer() - self.checked_at, 3) if self.checked_at is not None else None
+        }
@@ -1,21 +1,100 @@
+import asyncio
 import httpx
 import json
-from typing import Optional, Dict, Any
+import os
+from typing import Optional, Dict, Any, List
 from app.config import settings
+from app.rasa.classifier import IntentClassifier, normalize_text
+from app.rasa.health import RasaHealth
+from app.utils.cache import TTLCache, MISSING
+from app.utils.http import create_client, pool_stats
+from app.utils.metrics import metrics
 import logging
 
 logger = logging.getLogger(__name__)
 
+INTENT_CONFIDENCE_THRESHOLD = 0.5
+RETRY_BACKOFF = 0.5  # seconds before the first retry, doubled on each next one
+
+# Menu buttons handled by bot routers, never sent to Rasa
+MENU_COMMANDS = frozenset([
+    "👤 Мой профиль",
+    "💬 Общение",
+    "🎉 Мероприятия",
+    "❓ Помощь",
+    "⚙️ Админ панель",
+    "🔙 Назад"
+])
+
+
+def intent_from_parse(result: Dict[str, Any]) -> Optional[str]:
+    """Intent name of a /model/parse result when it is confident enough"""
+    intent = result.get("intent") or {}
+    if intent.get("confidence", 0) > INTENT_CONFIDENCE_THRESHOLD:
+        return intent.get("name")
+    return None
+
 
 class RasaIntegration:
     """Integration with Rasa server for natural language processing"""
     
     def __init__(self, server_url: str = None):
         self.server_url = server_url or settings.rasa_server_url
-        self.session = httpx.AsyncClient(timeout=10.0)
+        self._session: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.health = RasaHealth(self._probe_status)
+        self.model_fingerprint: Optional[str] = None
+        self.intent_cache = TTLCache(settings.rasa_intent_cache_size, settings.rasa_intent_cache_ttl)
+        self.response_cache = TTLCache(settings.rasa_intent_cache_size, settings.rasa_intent_cache_ttl)
+        self.static_intents = {
+            intent.strip() for intent in settings.rasa_static_intents.split(",") if intent.strip()
+        }
+        self._local_classifier: Optional[IntentClassifier] = None
+        metrics.register("rasa_intent_cache", self.intent_cache.stats)
+        metrics.register("rasa_response_cache", self.response_cache.stats)
+        metrics.register("rasa_http_pool", self.pool_stats)
+    
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """HTTP client bound to the running event loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.is_closed or self._loop is not loop:
+            self._session = create_client(
+                max_connections=settings.rasa_max_connections,
+                max_keepalive=settings.rasa_max_keepalive,
+                keepalive_expiry=settings.rasa_keepalive_expiry,
+                connect_timeout=settings.rasa_connect_timeout,
+                read_timeout=settings.rasa_read_timeout,
+                http2=settings.rasa_http2
+            )
+            self._loop = loop
+        return self._session
+    
+    @session.setter
+    def session(self, client: httpx.AsyncClient):
+        self._session = client
+        self._loop = asyncio.get_running_loop()
+    
+    def pool_stats(self) -> dict:
+        if self._session is None:
+            return {}
+        return pool_stats(self._session)
     
     async def process_message(self, message: str, sender_id: str) -> Optional[Dict[Any, Any]]:
-        """Process message through Rasa and get response"""
+        """Process message through Rasa and get response
+        
+        Responses of intents listed in RASA_STATIC_INTENTS do not depend on
+        the conversation, so they are memoized per model.
+        """
+        intent = await self.get_intent(message) if self.static_intents else None
+        if intent in self.static_intents:
+            cached = self.response_cache.get((self.model_fingerprint, intent))
+            if cached is not MISSING:
+                return cached
+        
+        if not await self.health.is_available():
+            return None
+        
         try:
             payload = {
                 "sender": sender_id,
@@ -26,19 +105,55 @@ class RasaIntegration:
                 f"{self.server_url}/webhooks/rest/webhook",
                 json=payload
             )
+            self._record(response)
             
             if response.status_code == 200:
                 result = response.json()
                 if result:
+                    if intent in self.static_intents:
+                        self.response_cache.set((self.model_fingerprint, intent), result[0])
                     return result[0]  # Return first response
                 
         except Exception as e:
             logger.error(f"Rasa integration error: {e}")
+            self.health.record_failure()
         
         return None
     
+    @property
+    def local_classifier(self) -> Optional[IntentClassifier]:
+        """In-process classifier trained on RASA_NLU_PATH, loaded on first use"""
+        if self._local_classifier is None and settings.rasa_local_classifier:
+            if os.path.exists(settings.rasa_nlu_path):
+                self._local_classifier = IntentClassifier.from_nlu(settings.rasa_nlu_path)
+                logger.info(f"Local intent classifier: {len(self._local_classifier.intents)} intents")
+        return self._local_classifier
+    
+    def classify_locally(self, message: str) -> Optional[str]:
+        """Intent from the local classifier when it is confident, None otherwise"""
+        if self.local_classifier is None:
+            return None
+        
+        intent = self.local_classifier.classify(
+            message, settings.rasa_local_min_confidence, settings.rasa_local_min_margin
+        )
+        metrics.inc("rasa_local_intents_total" if intent else "rasa_local_fallbacks_total")
+        return intent
+    
     async def get_intent(self, message: str) -> Optional[str]:
-        """Get intent classification from Rasa"""
+        """Get intent classification, locally for clear messages, from Rasa otherwise"""
+        intent_name = self.classify_locally(message)
+        if intent_name is not None:
+            return intent_name
+        
+        text = normalize_text(message)
+        intent_name = self.intent_cache.get((self.model_fingerprint, text))
+        if intent_name is not MISSING:
+            return intent_name
+        
+        if not await self.health.is_available():
+            return None
+        
         try:
             payload = {"text": message}
             
@@ -46,32 +161,112 @@ class RasaIntegration:
                 f"{self.server_url}/model/parse",
                 json=payload
             )
+            self._record(response)
             
             if response.status_code == 200:
-                result = response.json()
-                intent = result.get("intent", {})
-                if intent.get("confidence", 0) > 0.5:  # Threshold for intent confidence
-                    return intent.get("name")
+                intent_name = intent_from_parse(response.json())
+                self.intent_cache.set((self.model_fingerprint, text), intent_name)
+                return intent_name
                 
         except Exception as e:
             logger.error(f"Intent recognition error: {e}")
+            self.health.record_failure()
         
         return None
     
+    async def parse_many(
+        self,
+        texts: List[str],
+        concurrency: int = None,
+        retries: int = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Parse texts with bounded concurrency, results in input order
+        
+        Equal texts are parsed once. Transport errors and 5xx responses are
+        retried with exponential backoff; texts that still fail get None.
+        Parsed intents also warm the get_intent cache.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.rasa_parse_concurrency)
+        retries = settings.rasa_parse_retries if retries is None else retries
+        
+        async def parse_one(text: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self._parse(text, retries)
+        
+        unique = list(dict.fromkeys(texts))
+        results = await asyncio.gather(*(parse_one(text) for text in unique))
+        parsed = dict(zip(unique, results))
+        return [parsed[text] for text in texts]
+    
+    async def _parse(self, text: str, retries: int) -> Optional[Dict[str, Any]]:
+        for attempt in range(retries + 1):
+            if attempt:
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+            
+            try:
+                response = await self.session.post(f"{self.server_url}/model/parse", json={"text": text})
+            except httpx.TransportError as e:
+                logger.warning(f"Rasa parse attempt {attempt + 1} failed: {e}")
+                self.health.record_failure()
+                continue
+            
+            self._record(response)
+            if response.status_code >= 500:
+                continue
+            if response.status_code != 200:
+                return None
+            
+            result = response.json()
+            self.intent_cache.set((self.model_fingerprint, normalize_text(text)), intent_from_parse(result))
+            return result
+        
+        metrics.inc("rasa_parse_failures_total")
+        return None
+    
     async def is_rasa_available(self) -> bool:
-        """Check if Rasa server is available"""
-        try:
-            response = await self.session.get(f"{self.server_url}/status")
-            return response.status_code == 200
-        except:
+        """Check if Rasa server is available (cached, fails fast while circuit is open)"""
+        return await self.health.is_available()
+    
+    async def _probe_status(self) -> bool:
+        response = await self.session.get(
+            f"{self.server_url}/status", timeout=settings.rasa_health_timeout
+        )
+        if response.status_code != 200:
             return False
+        
+        self._set_model(response.json())
+        return True
+    
+    def _set_model(self, status: Dict[str, Any]):
+        """Drop cached intents and responses when a different model is loaded"""
+        fingerprint = status.get("fingerprint") or status.get("model_id") or status.get("model_file")
+        if isinstance(fingerprint, dict):
+            fingerprint = json.dumps(fingerprint, sort_keys=True)
+        
+        if fingerprint != self.model_fingerprint:
+            if self.model_fingerprint is not None:
+                logger.info(f"Rasa model changed to {fingerprint}, clearing intent cache")
+                metrics.inc("rasa_model_changes_total")
+            self.model_fingerprint = fingerprint
+            self.intent_cache.clear()
+            self.response_cache.clear()
+    
+    def _record(self, response: httpx.Response):
+        # Server errors count towards opening the circuit, client errors do not
+        if response.status_code >= 500:
+            self.health.record_failure()
+        else:
+            self.health.record_success()
     
     async def close(self):
-        """Close HTTP session"""
-        await self.session.aclose()
+        """Stop health probing and close HTTP session"""
+        await self.health.stop()
+        if self._session is not None:
+            await self._session.aclose()
+            self._session = None
 
 
-# Global instance
+# Global instance, HTTP client is created lazily and closed on dispatcher shutdown
 rasa_integration = RasaIntegration()
 
 
@@ -79,17 +274,7 @@ rasa_integration = RasaIntegration()
 async def should_use_rasa(message_text: str) -> bool:
     """Determine if message should be processed by Rasa"""
     # Use Rasa for conversational messages, not for menu commands
-    menu_commands = [
-        "👤 Мой профиль",
-        "💬 Общение",
-        "🎉 Мероприятия",
-        "❓ Помощь",
-        "⚙️ Админ панель",
-        "🔙 Назад"
-    ]
-    
-    # Don't use Rasa for menu commands
-    if message_text in menu_commands:
+    if message_text in MENU_COMMANDS:
         return False
     
     # Don't use Rasa for commands starting with /
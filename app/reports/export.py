@@ -0,0 +1,132 @@
+import asyncio
+import csv
+import io
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List
+
+from openpyxl import Workbook
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import (
+    User, Region, Interest, UserInterest, Event, EventInterest, EventParticipant, AdminActionType
+)
+from app.reports.queries import (
+    users_export_query, users_export_row, USERS_EXPORT_COLUMNS,
+    events_export_query, events_export_row, EVENTS_EXPORT_COLUMNS
+)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+REPORTS: Dict[str, Dict[str, Any]] = {
+    "users": {
+        "query": users_export_query,
+        "row": users_export_row,
+        "columns": USERS_EXPORT_COLUMNS,
+        "sheet_name": "Пользователи",
+        "filename": "users_export",
+        "tables": [User, Region, Interest, UserInterest],
+        "action_type": AdminActionType.EXPORT_USERS,
+    },
+    "events": {
+        "query": events_export_query,
+        "row": events_export_row,
+        "columns": EVENTS_EXPORT_COLUMNS,
+        "sheet_name": "Мероприятия",
+        "filename": "events_export",
+        "tables": [Event, User, Interest, EventInterest, EventParticipant],
+        "action_type": AdminActionType.EXPORT_EVENTS,
+    },
+}
+
+EXPORT_FORMATS = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+}
+
+
+async def iter_report_chunks(
+    session: AsyncSession,
+    report: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[List[Any]]:
+    """Stream report rows fetched from the database in chunks"""
+    result = await session.stream(
+        REPORTS[report]["query"]().execution_options(yield_per=chunk_size)
+    )
+    async for partition in result.partitions():
+        yield partition
+
+
+class XlsxWriter:
+    """Write rows through a write-only workbook"""
+    
+    def __init__(self, output: BinaryIO, columns: List[str], sheet_name: str):
+        self.output = output
+        self.columns = columns
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet(sheet_name)
+        self.sheet.append(columns)
+    
+    def write(self, rows: List[Any], formatter: Callable[[Any], Dict[str, Any]]):
+        for row in map(formatter, rows):
+            self.sheet.append([row[column] for column in self.columns])
+    
+    def close(self):
+        self.workbook.save(self.output)
+
+
+class CsvWriter:
+    """Write rows as CSV (UTF-8 with BOM for Excel)"""
+    
+    def __init__(self, output: BinaryIO, columns: List[str], sheet_name: str):
+        self.text = io.TextIOWrapper(output, encoding="utf-8-sig", newline="")
+        self.writer = csv.DictWriter(self.text, fieldnames=columns)
+        self.writer.writeheader()
+    
+    def write(self, rows: List[Any], formatter: Callable[[Any], Dict[str, Any]]):
+        self.writer.writerows(map(formatter, rows))
+    
+    def close(self):
+        self.text.flush()
+        self.text.detach()
+
+
+WRITERS: Dict[str, Callable] = {
+    "xlsx": XlsxWriter,
+    "csv": CsvWriter,
+}
+
+
+async def export_report(
+    session: AsyncSession,
+    report: str,
+    export_format: str,
+    output: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """Export report to a binary file object, return number of exported rows
+    
+    Rows are fetched on the event loop, formatting and file writes run in a
+    worker thread chunk by chunk so a large export does not block the loop.
+    """
+    spec = REPORTS[report]
+    writer = await asyncio.to_thread(
+        WRITERS[export_format], output, spec["columns"], spec["sheet_name"]
+    )
+    
+    count = 0
+    async for chunk in iter_report_chunks(session, report, chunk_size):
+        await asyncio.to_thread(writer.write, chunk, spec["row"])
+        count += len(chunk)
+    
+    await asyncio.to_thread(writer.close)
+    return count
+
+
+def iter_file(file: BinaryIO, chunk_size: int = 64 * 1024):
+    """Read file object in chunks and close it afterwards"""
+    try:
+        file.seek(0)
+        while chunk := file.read(chunk_size):
+            yield chunk
+    finally:
+        file.close()
@@ -0,0 +1,256 @@
+import asyncio
+import enum
+import hashlib
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.connection import AsyncSessionLocal
+from app.database.models import User, AdminAction, TableVersion
+from app.reports.export import export_report, REPORTS
+
+logger = logging.getLogger(__name__)
+
+
+class ExportJobStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ExportJob:
+    """Report export job handle"""
+    
+    def __init__(self, report: str, export_format: str, fingerprint: str, admin_phone: str = None):
+        self.id = uuid.uuid4().hex
+        self.report = report
+        self.export_format = export_format
+        self.fingerprint = fingerprint
+        self.admin_phone = admin_phone
+        self.status = ExportJobStatus.PENDING
+        self.file_path: Optional[str] = None
+        self.rows: Optional[int] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.callbacks: List[Callable[["ExportJob"], Awaitable[None]]] = []
+        self._done = asyncio.Event()
+    
+    @property
+    def cache_key(self) -> Tuple[str, str, str]:
+        return self.report, self.export_format, self.fingerprint
+    
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (ExportJobStatus.DONE, ExportJobStatus.FAILED)
+    
+    @property
+    def filename(self) -> str:
+        return f"{REPORTS[self.report]['filename']}.{self.export_format}"
+    
+    async def wait(self, timeout: float = None) -> "ExportJob":
+        """Wait until job is finished"""
+        await asyncio.wait_for(self._done.wait(), timeout)
+        return self
+    
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "report": self.report,
+            "format": self.export_format,
+            "status": self.status.value,
+            "rows": self.rows,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+async def report_fingerprint(session: AsyncSession, report: str) -> str:
+    """Fingerprint of the tables behind a report
+    
+    Table versions are bumped on every ORM flush that touches a table, row
+    counts and max ids also catch bulk inserts made outside the ORM.
+    """
+    columns = []
+    for model in REPORTS[report]["tables"]:
+        columns.append(
+            select(TableVersion.version)
+            .where(TableVersion.table_name == model.__tablename__)
+            .scalar_subquery()
+        )
+        columns.append(select(func.count()).select_from(model).scalar_subquery())
+        columns.append(select(func.max(model.id)).scalar_subquery())
+    
+    result = await session.execute(select(*columns))
+    return hashlib.sha1(repr(tuple(result.one())).encode()).hexdigest()
+
+
+class ExportJobManager:
+    """Worker pool generating report files in the background"""
+    
+    def __init__(
+        self,
+        workers: int = None,
+        cache_ttl: int = None,
+        exports_dir: str = None,
+        session_factory: Callable[[], AsyncSession] = None
+    ):
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.workers = workers or settings.export_workers
+        self.cache_ttl = cache_ttl if cache_ttl is not None else settings.export_cache_ttl
+        self.exports_dir = exports_dir or settings.exports_dir
+        self.jobs: Dict[str, ExportJob] = {}
+        self._cache: Dict[Tuple[str, str, str], ExportJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+    
+    def start(self):
+        """Start worker tasks on the running event loop"""
+        if self._tasks:
+            return
+        
+        os.makedirs(self.exports_dir, exist_ok=True)
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"export-worker-{i}")
+            for i in range(self.workers)
+        ]
+    
+    async def stop(self):
+        """Cancel worker tasks"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+    
+    async def submit(
+        self,
+        report: str,
+        export_format: str = "xlsx",
+        admin_phone: str = None,
+        callback: Callable[[ExportJob], Awaitable[None]] = None
+    ) -> ExportJob:
+        """Enqueue export job or return a cached/in-flight job for the same data"""
+        if report not in REPORTS:
+            raise ValueError(f"Unknown report: {report}")
+        
+        self.start()
+        self._prune()
+        
+        async with self.session_factory() as session:
+            fingerprint = await report_fingerprint(session, report)
+        
+        job = self._cache.get((report, export_format, fingerprint))
+        if job is None or job.status == ExportJobStatus.FAILED or (
+            job.status == ExportJobStatus.DONE and not os.path.exists(job.file_path)
+        ):
+            job = ExportJob(report, export_format, fingerprint, admin_phone)
+            self.jobs[job.id] = job
+            self._cache[job.cache_key] = job
+            await self._queue.put(job)
+        
+        if callback:
+            if job.is_finished:
+                asyncio.create_task(self._run_callback(callback, job))
+            else:
+                job.callbacks.append(callback)
+        
+        return job
+    
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        return self.jobs.get(job_id)
+    
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+    
+    async def _run(self, job: ExportJob):
+        job.status = ExportJobStatus.RUNNING
+        file_path = os.path.join(self.exports_dir, f"{job.report}_{job.id}.{job.export_format}")
+        started = time.perf_counter()
+        
+        try:
+            async with self.session_factory() as session:
+                with open(f"{file_path}.part", "wb") as output:
+                    job.rows = await export_report(
+                        session, job.report, job.export_format, output, settings.export_chunk_size
+                    )
+                os.replace(f"{file_path}.part", file_path)
+                job.file_path = file_path
+                await self._log_action(session, job)
+            
+            job.status = ExportJobStatus.DONE
+            logger.info(
+                f"Export {job.report}.{job.export_format} ({job.rows} rows) "
+                f"finished in {time.perf_counter() - started:.2f}s"
+            )
+        except Exception as e:
+            logger.error(f"Export job {job.id} failed: {e}")
+            job.status = ExportJobStatus.FAILED
+            job.error = str(e)
+            if os.path.exists(f"{file_path}.part"):
+                os.remove(f"{file_path}.part")
+        finally:
+            job.finished_at = datetime.utcnow()
+            job._done.set()
+        
+        for callback in job.callbacks:
+            await self._run_callback(callback, job)
+        job.callbacks.clear()
+    
+    async def _run_callback(self, callback: Callable[[ExportJob], Awaitable[None]], job: ExportJob):
+        try:
+            await callback(job)
+        except Exception as e:
+            logger.error(f"Export job {job.id} callback failed: {e}")
+    
+    async def _log_action(self, session: AsyncSession, job: ExportJob):
+        if not job.admin_phone:
+            return
+        
+        admin_result = await session.execute(
+            select(User).where(User.phone_number == job.admin_phone)
+        )
+        admin_user = admin_result.scalar_one_or_none()
+        
+        if admin_user:
+            action = AdminAction(
+                admin_user_id=admin_user.id,
+                action_type=REPORTS[job.report]["action_type"],
+                description=f"Экспорт {job.rows} строк ({job.report})",
+                file_path=job.file_path,
+                created_at=datetime.utcnow()
+            )
+            session.add(action)
+            await session.commit()
+    
+    def _prune(self):
+        """Forget finished jobs older than cache TTL and remove their files"""
+        now = datetime.utcnow()
+        for job_id, job in list(self.jobs.items()):
+            if not job.is_finished or (now - job.finished_at).total_seconds() < self.cache_ttl:
+                continue
+            
+            del self.jobs[job_id]
+            if self._cache.get(job.cache_key) is job:
+                del self._cache[job.cache_key]
+            if job.file_path and os.path.exists(job.file_path):
+                os.remove(job.file_path)
+
+
+# Global instance
+export_jobs = ExportJobManager()
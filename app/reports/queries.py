@@ -0,0 +1,142 @@
+from sqlalchemy import select, String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.database.models import User, Event, Interest, Region, UserInterest, EventInterest, EventParticipant
+
+
+class string_agg(FunctionElement):
+    """Concatenate grouped string values (GROUP_CONCAT / STRING_AGG)"""
+    type = String()
+    inherit_cache = True
+    name = "string_agg"
+
+
+@compiles(string_agg)
+def _compile_string_agg(element, compiler, **kw):
+    return "string_agg(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(string_agg, "sqlite")
+def _compile_group_concat(element, compiler, **kw):
+    return "group_concat(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(string_agg, "mysql")
+def _compile_mysql_group_concat(element, compiler, **kw):
+    column, separator = list(element.clauses)
+    return "group_concat(%s SEPARATOR %s)" % (
+        compiler.process(column, **kw),
+        compiler.process(separator, **kw),
+    )
+
+
+def users_export_query():
+    """Users with region name and comma separated interests in one query"""
+    interests = (
+        select(
+            UserInterest.user_id.label("user_id"),
+            string_agg(Interest.name, ", ").label("interests")
+        )
+        .join(Interest, Interest.id == UserInterest.interest_id)
+        .group_by(UserInterest.user_id)
+        .subquery()
+    )
+    
+    return (
+        select(
+            User.phone_number,
+            User.first_name,
+            User.last_name,
+            User.age,
+            User.gender,
+            Region.name.label("region_name"),
+            interests.c.interests,
+            User.photo_url
+        )
+        .join(Region, User.region_id == Region.id)
+        .outerjoin(interests, interests.c.user_id == User.id)
+        .order_by(User.id)
+    )
+
+
+def events_export_query():
+    """Events with creator, interests and participants in one query"""
+    interests = (
+        select(
+            EventInterest.event_id.label("event_id"),
+            string_agg(Interest.name, ", ").label("interests")
+        )
+        .join(Interest, Interest.id == EventInterest.interest_id)
+        .group_by(EventInterest.event_id)
+        .subquery()
+    )
+    
+    participants = (
+        select(
+            EventParticipant.event_id.label("event_id"),
+            string_agg(User.first_name + " " + User.last_name, "; ").label("participants")
+        )
+        .join(User, User.id == EventParticipant.user_id)
+        .group_by(EventParticipant.event_id)
+        .subquery()
+    )
+    
+    return (
+        select(
+            Event.title,
+            Event.event_date,
+            Event.event_time,
+            interests.c.interests,
+            Event.address,
+            Event.description,
+            Event.image_url,
+            User.first_name.label("creator_first_name"),
+            User.last_name.label("creator_last_name"),
+            User.phone_number.label("creator_phone"),
+            participants.c.participants
+        )
+        .join(User, Event.creator_id == User.id)
+        .outerjoin(interests, interests.c.event_id == Event.id)
+        .outerjoin(participants, participants.c.event_id == Event.id)
+        .order_by(Event.id)
+    )
+
+
+USERS_EXPORT_COLUMNS = [
+    'Номер телефона', 'Имя', 'Фамилия', 'Возраст', 'Пол', 'Регион', 'Интересы', 'Ссылка на фото'
+]
+
+EVENTS_EXPORT_COLUMNS = [
+    'Название', 'Дата', 'Время', 'Интересы', 'Адрес', 'Описание',
+    'Ссылка на изображение', 'Организатор', 'Участники'
+]
+
+
+def users_export_row(row) -> dict:
+    """Format users export row for the report"""
+    return {
+        'Номер телефона': row.phone_number,
+        'Имя': row.first_name,
+        'Фамилия': row.last_name,
+        'Возраст': row.age,
+        'Пол': row.gender.value if row.gender else '',
+        'Регион': row.region_name,
+        'Интересы': row.interests or '',
+        'Ссылка на фото': row.photo_url or ''
+    }
+
+
+def events_export_row(row) -> dict:
+    """Format events export row for the report"""
+    return {
+        'Название': row.title,
+        'Дата': row.event_date.strftime('%Y-%m-%d'),
+        'Время': row.event_time,
+        'Интересы': row.interests or '',
+        'Адрес': row.address,
+        'Описание': row.description or '',
+        'Ссылка на изображение': row.image_url or '',
+        'Организатор': f"{row.creator_first_name} {row.creator_last_name} ({row.creator_phone})",
+        'Участники': row.participants or ''
+    }
@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from datetime import datetime
+
+from actions import db, reports
+from app.reports.jobs import ExportJobManager, ExportJobStatus
+from app.database.models import Base, User, Region
+
+
+@pytest.fixture
+async def actions_db(tmp_path, monkeypatch):
+    """Action server database in a temporary SQLite file"""
+    engine = db.create_actions_engine(f"sqlite+aiosqlite:///{tmp_path / 'actions.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(db, "AsyncSessionLocal", session_factory)
+    
+    async with session_factory() as session:
+        region = Region(name="Москва")
+        session.add(region)
+        await session.flush()
+        session.add(User(telegram_id=1, phone_number="+1", first_name="Иван", last_name="Иванов", age=25, region_id=region.id, is_admin=True))
+        await session.commit()
+    
+    yield engine
+    await engine.dispose()
+
+
+class TestActionsDatabase:
+    """Test action server data access layer"""
+    
+    async def test_wal_and_concurrent_access(self, actions_db):
+        """Test pooled connections use WAL and serve concurrent actions"""
+        async with actions_db.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        
+        results = await asyncio.gather(*[db.is_admin("+1") for _ in range(10)])
+        assert all(results)
+        assert await db.is_admin("+2") is False
+        assert await db.is_admin(None) is False
+    
+    async def test_save_event(self, actions_db):
+        """Test events are saved for registered creators only"""
+        event = await db.save_event("+1", "Пикник", datetime(2024, 6, 1), "12:00", "Парк")
+        assert event.id is not None
+        assert event.creator_id == 1
+        
+        assert await db.save_event("+2", "Пикник", datetime(2024, 6, 1), "12:00", "Парк") is None
+
+
+class FakeBot:
+    def __init__(self):
+        self.documents = []
+    
+    async def send_document(self, chat_id, document, caption=None):
+        self.documents.append((chat_id, document.path, caption))
+
+
+class TestActionReports:
+    """Test admin report actions backend"""
+    
+    async def test_report_sent_to_chat(self, actions_db, tmp_path, monkeypatch):
+        """Test report is exported in background and sent as document"""
+        bot = FakeBot()
+        manager = ExportJobManager(workers=1, exports_dir=str(tmp_path / "exports"), session_factory=db.AsyncSessionLocal)
+        monkeypatch.setattr(reports, "report_jobs", manager)
+        monkeypatch.setattr(reports, "get_bot", lambda: bot)
+        
+        job = await reports.submit_report("users", 42, "+1", "Отчет")
+        await job.wait(timeout=10)
+        await asyncio.sleep(0)
+        
+        assert job.status == ExportJobStatus.DONE
+        assert job.rows == 1
+        assert bot.documents == [(42, job.file_path, "Отчет\n\nСтрок в отчете: 1")]
+        await manager.stop()
+
@@ -2,12 +2,15 @@ import pytest
 from httpx import AsyncClient
 from app.api.main import app
 from app.database.connection import init_database
+from app.maps.geocoder import geocoder
 
 
 @pytest.fixture
 async def client():
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
+    # Shutdown handlers do not run for ASGI test client
+    await geocoder.close()
 
 
 @pytest.fixture
@@ -44,3 +47,12 @@ class TestAPI:
         response = await client.post("/api/admin/upload-data", files=files, data=data)
         assert response.status_code == 403
         assert "прав" in response.json()["detail"]
+    
+    async def test_telegram_webhook_secret(self, client: AsyncClient):
+        """Test webhook rejects requests without secret token"""
+        response = await client.post(
+            "/api/telegram/webhook",
+            json={"update_id": 1},
+            headers={"X-Telegram-Bot-Api-Secret-Token": "wrong"}
+        )
+        assert response.status_code == 403
@@ -0,0 +1,275 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import Update
+from aiogram.fsm.storage.base import StorageKey
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.bot.cache import user_cache, UserSnapshot, cache_user, get_cached_user
+from app.utils.cache import MISSING
+from app.bot.middlewares.auth import AuthMiddleware
+from app.bot.middlewares.database import DatabaseMiddleware
+from app.bot.middlewares.scheduler import SchedulerMiddleware
+from app.bot.states.registration import RegistrationStates
+from app.bot.storage import ExpiringMemoryStorage, SQLiteStorage
+from app.bot.webhook import WebhookProcessor, QueueFullError
+from app.database.models import Base, User, Region
+
+
+@pytest.fixture
+async def session_factory():
+    """Create session factory with statement counter"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        echo=False
+    )
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    AsyncSessionLocal = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    AsyncSessionLocal.statements = []
+    
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, *args):
+        AsyncSessionLocal.statements.append(statement)
+    
+    user_cache.clear()
+    yield AsyncSessionLocal
+    user_cache.clear()
+    
+    await engine.dispose()
+
+
+def make_message(telegram_id: int):
+    return SimpleNamespace(from_user=SimpleNamespace(id=telegram_id))
+
+
+async def handler(event, data):
+    return data
+
+
+class TestAuthMiddleware:
+    """Test user lookup caching in auth middleware"""
+    
+    async def test_user_cached(self, session_factory):
+        """Test repeated updates from one user cost one query"""
+        async with session_factory() as session:
+            region = Region(name="Москва")
+            session.add(region)
+            await session.flush()
+            session.add(User(telegram_id=1, phone_number="+1", first_name="Иван", last_name="Иванов", age=25, region_id=region.id))
+            await session.commit()
+            
+            session_factory.statements.clear()
+            middleware = AuthMiddleware()
+            for _ in range(5):
+                data = await middleware(handler, make_message(1), {"session": session})
+            
+            assert len(session_factory.statements) == 1
+            assert isinstance(data["user"], UserSnapshot)
+            assert data["user"].first_name == "Иван"
+            assert data["is_registered"] is True
+    
+    async def test_cache_invalidated_on_write(self, session_factory):
+        """Test registration and profile writes invalidate cached user"""
+        async with session_factory() as session:
+            middleware = AuthMiddleware()
+            data = await middleware(handler, make_message(2), {"session": session})
+            assert data["is_registered"] is False
+            
+            region = Region(name="Москва")
+            session.add(region)
+            await session.flush()
+            user = User(telegram_id=2, phone_number="+2", first_name="Петр", last_name="Петров", age=30, region_id=region.id)
+            session.add(user)
+            await session.commit()
+            
+            data = await middleware(handler, make_message(2), {"session": session})
+            assert data["is_registered"] is True
+            
+            user.first_name = "Павел"
+            await session.commit()
+            
+            data = await middleware(handler, make_message(2), {"session": session})
+            assert data["user"].first_name == "Павел"
+    
+    async def test_cache_invalidated_after_commit(self, session_factory):
+        """Test user re-cached between flush and commit is dropped on commit"""
+        async with session_factory() as session:
+            region = Region(name="Москва")
+            session.add(region)
+            await session.flush()
+            user = User(telegram_id=3, phone_number="+3", first_name="Олег", last_name="Олегов", age=40, region_id=region.id)
+            session.add(user)
+            await session.commit()
+            
+            user.first_name = "Остап"
+            await session.flush()
+            
+            # Concurrent update reads the pre-commit row
+            cache_user(3, User(telegram_id=3, first_name="Олег"))
+            await session.commit()
+            
+            assert get_cached_user(3) is MISSING
+
+
+class TestDatabaseMiddleware:
+    """Test lazy session creation in database middleware"""
+    
+    async def test_no_session_without_queries(self, session_factory):
+        """Test update that never queries does not open a session"""
+        middleware = DatabaseMiddleware(session_factory)
+        
+        data = await middleware(handler, make_message(1), {})
+        
+        assert data["session"].is_active is False
+        assert data["session"].sessions_opened == 0
+    
+    async def test_session_opened_on_first_use(self, session_factory):
+        """Test session is opened on first query and queries are counted"""
+        middleware = DatabaseMiddleware(session_factory)
+        
+        async def querying_handler(event, data):
+            await data["session"].execute(select(User))
+            await data["session"].execute(select(Region))
+            return data
+        
+        data = await middleware(querying_handler, make_message(1), {})
+        
+        assert data["session"].sessions_opened == 1
+        assert data["session"].queries == 2
+
+
+class TestStorage:
+    """Test FSM storage backends"""
+    
+    key = StorageKey(bot_id=1, chat_id=2, user_id=3)
+    
+    async def test_memory_storage_ttl(self):
+        """Test memory storage drops expired and cleared records"""
+        storage = ExpiringMemoryStorage(state_ttl=60)
+        await storage.set_state(self.key, RegistrationStates.phone)
+        await storage.set_data(self.key, {"phone": "+1"})
+        
+        assert await storage.get_state(self.key) == RegistrationStates.phone.state
+        assert await storage.get_data(self.key) == {"phone": "+1"}
+        
+        storage.touched[self.key] -= 61
+        assert await storage.get_state(self.key) is None
+        assert len(storage.storage) == 0
+        
+        await storage.get_state(StorageKey(bot_id=1, chat_id=5, user_id=5))
+        assert len(storage.storage) == 0
+    
+    async def test_sqlite_storage(self, tmp_path):
+        """Test SQLite storage shares state between instances"""
+        path = str(tmp_path / "fsm.db")
+        storage = SQLiteStorage(path, state_ttl=60)
+        await storage.set_state(self.key, RegistrationStates.age)
+        await storage.update_data(self.key, {"first_name": "Иван"})
+        await storage.close()
+        
+        storage = SQLiteStorage(path, state_ttl=60)
+        assert await storage.get_state(self.key) == RegistrationStates.age.state
+        assert await storage.get_data(self.key) == {"first_name": "Иван"}
+        other = SQLiteStorage(path, prefix="other")
+        assert await other.get_state(self.key) is None
+        await other.close()
+        
+        await storage.set_state(self.key, None)
+        await storage.set_data(self.key, {})
+        await storage.purge()
+        assert await storage.get_state(self.key) is None
+        await storage.close()
+
+
+def make_update(update_id: int, text: str, user_id: int = 10) -> dict:
+    """Recorded Telegram update JSON"""
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 1700000000,
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Иван"},
+            "text": text
+        }
+    }
+
+
+class TestWebhook:
+    """Test webhook update processing"""
+    
+    async def test_updates_fed_to_dispatcher(self):
+        """Test posted updates reach handlers and full queue is rejected"""
+        received = []
+        router = Router()
+        
+        @router.message()
+        async def echo(message):
+            received.append(message.text)
+        
+        dp = Dispatcher()
+        dp.include_router(router)
+        processor = WebhookProcessor(queue_size=2, workers=1)
+        await processor.start(Bot("123:abc"), dp, set_webhook=False)
+        
+        processor.enqueue(make_update(1, "a"))
+        processor.enqueue(make_update(2, "b"))
+        with pytest.raises(QueueFullError):
+            processor.enqueue(make_update(3, "c"))
+        
+        await processor.stop()
+        assert received == ["a", "b"]
+        assert not processor.is_running
+
+
+class TestScheduler:
+    """Test concurrent update scheduling"""
+    
+    async def test_per_user_order_and_limit(self):
+        """Test updates of one user run in order and others run concurrently"""
+        log = []
+        running = []
+        peak = []
+        router = Router()
+        
+        @router.message()
+        async def slow(message):
+            running.append(message.text)
+            log.append(("start", message.text))
+            peak.append(len(running))
+            await asyncio.sleep(0.05 if message.text == "a1" else 0.01)
+            running.remove(message.text)
+            log.append(("end", message.text))
+        
+        dp = Dispatcher()
+        scheduler = SchedulerMiddleware(max_concurrent=2)
+        dp.update.outer_middleware(scheduler)
+        dp.include_router(router)
+        bot = Bot("123:abc")
+        
+        updates = [
+            make_update(1, "a1", user_id=1),
+            make_update(2, "a2", user_id=1),
+            make_update(3, "b1", user_id=2),
+            make_update(4, "c1", user_id=3),
+        ]
+        await asyncio.gather(*[
+            dp.feed_update(bot, Update.model_validate(update, context={"bot": bot}))
+            for update in updates
+        ])
+        
+        assert log.index(("end", "a1")) < log.index(("start", "a2"))
+        assert log.index(("start", "b1")) < log.index(("start", "a2"))
+        assert max(peak) == 2
+        assert scheduler.stats() == {"max_concurrent": 2, "active": 0, "queued": 0, "users_waiting": 0}
+        assert not scheduler._locks
+        await bot.session.close()
+
@@ -3,6 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.database.models import Base, User, Region, Interest
 from app.database.models.user import GenderEnum
+from app.database.bulk import insert_ignore
+from sqlalchemy import select
 
 
 @pytest.fixture
@@ -77,3 +79,25 @@ class TestModels:
         assert user.age == 25
         assert user.is_admin is False
         assert user.is_active is True
+
+
+class TestBulkInsert:
+    """Test bulk insert helpers"""
+    
+    async def test_insert_ignore(self, async_session: AsyncSession):
+        """Test bulk insert skips existing names"""
+        async_session.add(Region(name="Москва"))
+        await async_session.flush()
+        
+        inserted = await insert_ignore(
+            async_session,
+            Region,
+            [{"name": name} for name in ("Москва", "Казань", "Самара")],
+            ["name"],
+            batch_size=2
+        )
+        await async_session.commit()
+        
+        result = await async_session.execute(select(Region.name).order_by(Region.id))
+        assert inserted == 2
+        assert result.scalars().all() == ["Москва", "Казань", "Самара"]
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import httpx
+import pytest
+
+from app.config import settings
+from app.rasa.classifier import IntentClassifier, load_nlu_examples
+from app.rasa.health import RasaHealth, CircuitState
+from app.rasa import integration
+from app.rasa.integration import RasaIntegration, normalize_text
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRasaHealth:
+    """Test cached Rasa availability and circuit breaker"""
+    
+    async def test_circuit_breaker(self):
+        """Test probes are cached, circuit opens, fails fast and recovers"""
+        clock = FakeClock()
+        probes = []
+        up = False
+        
+        async def probe():
+            probes.append(clock.now)
+            return up
+        
+        health = RasaHealth(probe, ttl=5, failure_threshold=2, reset_timeout=30, probe_interval=60, timer=clock)
+        
+        assert await health.is_available() is False
+        assert await health.is_available() is False
+        assert len(probes) == 1
+        
+        clock.now = 6
+        assert await health.is_available() is False
+        assert health.state == CircuitState.OPEN
+        
+        clock.now = 20
+        assert await health.is_available() is False
+        assert len(probes) == 2
+        
+        up = True
+        clock.now = 37
+        assert await health.is_available() is True
+        assert health.state == CircuitState.CLOSED
+        assert len(probes) == 3
+        
+        health.record_failure()
+        health.record_failure()
+        assert health.state == CircuitState.OPEN
+        await health.stop()
+
+
+class TestIntentCache:
+    """Test intent and response caching"""
+    
+    async def test_intent_cache_per_model(self, monkeypatch):
+        """Test same phrases hit the cache until the model changes"""
+        monkeypatch.setattr(settings, "rasa_local_classifier", False)
+        calls = []
+        model = {"model_id": "m1"}
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if request.url.path == "/status":
+                return httpx.Response(200, json=model)
+            if request.url.path == "/model/parse":
+                return httpx.Response(200, json={"intent": {"name": "greet", "confidence": 0.9}})
+            return httpx.Response(200, json=[{"text": "Привет!"}])
+        
+        rasa = RasaIntegration("http://rasa")
+        rasa.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        rasa.static_intents = {"greet"}
+        
+        assert normalize_text("  Привет!!  ") == "привет"
+        assert await rasa.get_intent("Привет") == "greet"
+        assert await rasa.get_intent("привет!") == "greet"
+        assert calls.count("/model/parse") == 1
+        assert rasa.intent_cache.stats()["hits"] == 1
+        
+        assert await rasa.process_message("привет", "1") == {"text": "Привет!"}
+        assert await rasa.process_message("Привет.", "2") == {"text": "Привет!"}
+        assert calls.count("/webhooks/rest/webhook") == 1
+        
+        model["model_id"] = "m2"
+        await rasa.health.check()
+        assert len(rasa.intent_cache) == 0
+        assert await rasa.get_intent("привет") == "greet"
+        assert calls.count("/model/parse") == 2
+        await rasa.close()
+
+
+class TestIntentClassifier:
+    """Test local intent classifier"""
+    
+    examples = [
+        ("привет", "greet"),
+        ("добрый день", "greet"),
+        ("здравствуйте", "greet"),
+        ("помощь", "help"),
+        ("что ты умеешь", "help"),
+        ("создать мероприятие", "create_event"),
+        ("новое мероприятие", "create_event"),
+    ]
+    
+    def test_load_nlu_examples(self, tmp_path):
+        """Test entity markup is stripped from training examples"""
+        path = tmp_path / "nlu.yml"
+        path.write_text(
+            'version: "3.1"\nnlu:\n- intent: provide_age\n  examples: |\n    - мне [25](age) лет\n',
+            encoding="utf-8"
+        )
+        assert load_nlu_examples(str(path)) == [("мне 25 лет", "provide_age")]
+    
+    def test_classify(self):
+        """Test clear texts are classified and ambiguous ones are left to Rasa"""
+        classifier = IntentClassifier().fit(self.examples)
+        
+        assert classifier.classify("Привет!", 0.6, 0.2) == "greet"
+        assert classifier.classify("создать новое мероприятие", 0.6, 0.2) == "create_event"
+        assert classifier.classify("какая завтра погода", 0.6, 0.2) is None
+        assert classifier.predict("ъъъ") == (None, 0.0, 0.0)
+    
+    async def test_local_intent_skips_rasa(self, monkeypatch):
+        """Test confident local intents do not call the Rasa server"""
+        monkeypatch.setattr(settings, "rasa_local_classifier", True)
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError("Rasa must not be called")
+        
+        rasa = RasaIntegration("http://rasa")
+        rasa.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        rasa._local_classifier = IntentClassifier().fit(self.examples)
+        
+        assert await rasa.get_intent("здравствуйте") == "greet"
+        await rasa.close()
+
+
+class TestParseMany:
+    """Test batch NLU parsing"""
+    
+    async def test_parse_many(self, monkeypatch):
+        """Test results keep input order, concurrency is bounded and errors are retried"""
+        monkeypatch.setattr(integration, "RETRY_BACKOFF", 0)
+        calls = []
+        in_flight = []
+        peak = []
+        
+        async def handler(request: httpx.Request) -> httpx.Response:
+            text = json.loads(request.read())["text"]
+            calls.append(text)
+            in_flight.append(text)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(text)
+            if "сбой" in text and calls.count(text) == 1:
+                return httpx.Response(503)
+            name = "greet" if "привет" in text else "help"
+            return httpx.Response(200, json={"intent": {"name": name, "confidence": 0.9}})
+        
+        rasa = RasaIntegration("http://rasa")
+        rasa.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        texts = ["привет", "помощь", "сбой", "привет", "что умеешь", "помоги"]
+        
+        results = await rasa.parse_many(texts, concurrency=2)
+        
+        assert [result["intent"]["name"] for result in results] == ["greet", "help", "help", "greet", "help", "help"]
+        assert len(calls) == 6
+        assert max(peak) == 2
+        await rasa.close()
+
+
+class TestHttpClient:
+    """Test Rasa HTTP client lifecycle"""
+    
+    async def test_lazy_client(self):
+        """Test client is created on first use with configured pool and closed with integration"""
+        rasa = RasaIntegration("http://rasa")
+        assert rasa.pool_stats() == {}
+        
+        session = rasa.session
+        assert rasa.session is session
+        assert session.timeout.connect == settings.rasa_connect_timeout
+        assert session.timeout.read == settings.rasa_read_timeout
+        assert rasa.pool_stats()["connections_active"] == 0
+        
+        await rasa.close()
+        assert session.is_closed
+        assert rasa.session is not session
+        await rasa.close()
+
@@ -0,0 +1,190 @@
+import pytest
+import io
+from datetime import datetime
+from sqlalchemy import select
+from openpyxl import load_workbook
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.models import Base, User, Region, Interest, UserInterest, Event, EventInterest, EventParticipant
+from app.reports.queries import users_export_query, users_export_row, events_export_query, events_export_row
+from app.reports.export import export_report
+from app.reports.jobs import ExportJobManager, ExportJobStatus
+
+
+@pytest.fixture
+async def session_factory():
+    """Create session factory for database with report data"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        echo=False
+    )
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    AsyncSessionLocal = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    
+    async with AsyncSessionLocal() as session:
+        region = Region(name="Москва")
+        sport = Interest(name="Спорт")
+        music = Interest(name="Музыка")
+        session.add_all([region, sport, music])
+        await session.flush()
+        
+        ivan = User(telegram_id=1, phone_number="+1", first_name="Иван", last_name="Иванов", age=25, region_id=region.id)
+        petr = User(telegram_id=2, phone_number="+2", first_name="Петр", last_name="Петров", age=30, region_id=region.id)
+        session.add_all([ivan, petr])
+        await session.flush()
+        
+        session.add_all([
+            UserInterest(user_id=ivan.id, interest_id=sport.id),
+            UserInterest(user_id=ivan.id, interest_id=music.id),
+        ])
+        
+        event = Event(
+            title="Забег",
+            event_date=datetime(2024, 5, 1),
+            event_time="10:00",
+            address="Парк",
+            creator_id=ivan.id,
+            created_at=datetime.utcnow()
+        )
+        session.add(event)
+        await session.flush()
+        
+        session.add_all([
+            EventInterest(event_id=event.id, interest_id=sport.id),
+            EventParticipant(event_id=event.id, user_id=ivan.id, joined_at=datetime.utcnow()),
+            EventParticipant(event_id=event.id, user_id=petr.id, joined_at=datetime.utcnow()),
+        ])
+        await session.commit()
+    
+    yield AsyncSessionLocal
+    
+    await engine.dispose()
+
+
+@pytest.fixture
+async def async_session(session_factory):
+    """Create async session with report data for testing"""
+    async with session_factory() as session:
+        yield session
+
+
+class TestReportQueries:
+    """Test admin report queries"""
+    
+    async def test_users_export(self, async_session: AsyncSession):
+        """Test users export aggregates interests per user"""
+        result = await async_session.execute(users_export_query())
+        rows = [users_export_row(row) for row in result.all()]
+        
+        assert len(rows) == 2
+        assert rows[0]['Имя'] == "Иван"
+        assert rows[0]['Регион'] == "Москва"
+        assert sorted(rows[0]['Интересы'].split(', ')) == ["Музыка", "Спорт"]
+        assert rows[1]['Интересы'] == ''
+    
+    async def test_events_export(self, async_session: AsyncSession):
+        """Test events export aggregates interests and participants per event"""
+        result = await async_session.execute(events_export_query())
+        rows = [events_export_row(row) for row in result.all()]
+        
+        assert len(rows) == 1
+        assert rows[0]['Интересы'] == "Спорт"
+        assert rows[0]['Организатор'] == "Иван Иванов (+1)"
+        assert sorted(rows[0]['Участники'].split('; ')) == ["Иван Иванов", "Петр Петров"]
+    
+    def test_string_agg_dialects(self):
+        """Test string aggregation compiles for SQLite and PostgreSQL"""
+        query = users_export_query()
+        
+        assert "group_concat" in str(query.compile(dialect=sqlite.dialect()))
+        assert "string_agg" in str(query.compile(dialect=postgresql.dialect()))
+
+
+class TestReportExport:
+    """Test streaming report export"""
+    
+    async def test_export_users_csv(self, async_session: AsyncSession):
+        """Test users export to CSV"""
+        output = io.BytesIO()
+        exported = await export_report(async_session, "users", "csv", output, chunk_size=1)
+        
+        lines = output.getvalue().decode("utf-8-sig").splitlines()
+        assert exported == 2
+        assert lines[0].startswith("Номер телефона,Имя,Фамилия")
+        assert len(lines) == 3
+    
+    async def test_export_events_xlsx(self, async_session: AsyncSession):
+        """Test events export to Excel"""
+        output = io.BytesIO()
+        exported = await export_report(async_session, "events", "xlsx", output)
+        
+        output.seek(0)
+        sheet = load_workbook(output)["Мероприятия"]
+        rows = list(sheet.values)
+        assert exported == 1
+        assert rows[0][0] == "Название"
+        assert rows[1][0] == "Забег"
+
+
+class TestExportJobs:
+    """Test background export jobs"""
+    
+    async def test_export_job(self, session_factory, tmp_path):
+        """Test export job generates file and notifies callback"""
+        manager = ExportJobManager(workers=1, exports_dir=str(tmp_path), session_factory=session_factory)
+        delivered = []
+        
+        async def callback(job):
+            delivered.append(job.id)
+        
+        job = await manager.submit("users", "csv", callback=callback)
+        await job.wait(timeout=5)
+        await manager.stop()
+        
+        assert job.status == ExportJobStatus.DONE
+        assert job.rows == 2
+        assert job.file_path.startswith(str(tmp_path))
+        assert delivered == [job.id]
+    
+    async def test_export_job_cache(self, session_factory, tmp_path):
+        """Test export jobs are reused until report tables change"""
+        manager = ExportJobManager(workers=1, exports_dir=str(tmp_path), session_factory=session_factory)
+        
+        first = await (await manager.submit("users", "csv")).wait(timeout=5)
+        second = await manager.submit("users", "csv")
+        assert second is first
+        
+        async with session_factory() as session:
+            session.add(Region(name="Казань"))
+            await session.commit()
+        
+        third = await (await manager.submit("users", "csv")).wait(timeout=5)
+        await manager.stop()
+        
+        assert third is not first
+        assert third.status == ExportJobStatus.DONE
+    
+    async def test_export_job_cache_invalidated_on_update(self, session_factory, tmp_path):
+        """Test editing a user produces a fresh export"""
+        manager = ExportJobManager(workers=1, exports_dir=str(tmp_path), session_factory=session_factory)
+        
+        first = await (await manager.submit("users", "csv")).wait(timeout=5)
+        
+        async with session_factory() as session:
+            user = (await session.execute(select(User).where(User.telegram_id == 1))).scalar_one()
+            user.first_name = "Игорь"
+            await session.commit()
+        
+        second = await (await manager.submit("users", "csv")).wait(timeout=5)
+        await manager.stop()
+        
+        assert second is not first
+        with open(second.file_path, encoding="utf-8-sig") as f:
+            assert "Игорь" in f.read()
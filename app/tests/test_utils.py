@@ -0,0 +1,77 @@
+from app.utils.cache import TTLCache, MISSING
+from app.utils.metrics import Metrics, load_published
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """Test TTL cache"""
+    
+    def test_hit_and_miss(self):
+        """Test cache counts hits and misses"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", None)
+        
+        assert cache.get("a") is None
+        assert cache.get("b") is MISSING
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+    
+    def test_expiration(self):
+        """Test entries expire after TTL"""
+        timer = FakeTimer()
+        cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+        cache.set("a", 1)
+        
+        timer.now = 4
+        assert cache.get("a") == 1
+        timer.now = 6
+        assert cache.get("a") is MISSING
+        assert len(cache) == 0
+    
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+
+class TestMetrics:
+    """Test metrics registry"""
+    
+    def test_snapshot(self):
+        """Test counters, gauges, histograms and collectors"""
+        registry = Metrics()
+        registry.inc("requests", status="ok")
+        registry.set("queue_depth", 3)
+        registry.observe("latency", 0.02)
+        registry.register("cache", lambda: {"hits": 1})
+        
+        snapshot = registry.snapshot()
+        assert snapshot["counters"] == {"requests{status=ok}": 1}
+        assert snapshot["gauges"] == {"queue_depth": 3}
+        assert snapshot["histograms"]["latency"]["count"] == 1
+        assert snapshot["histograms"]["latency"]["p99"] == 0.025
+        assert snapshot["components"]["cache"] == {"hits": 1}
+    
+    def test_publish(self, tmp_path):
+        """Test snapshot published by one process is loaded by another"""
+        registry = Metrics()
+        registry.inc("bot_updates_total", 3)
+        registry.publish(str(tmp_path / "bot.json"))
+        
+        published = load_published(str(tmp_path))
+        assert published["bot"]["counters"] == {"bot_updates_total": 3}
+        assert load_published(str(tmp_path / "missing")) == {}
@@ -0,0 +1,45 @@
+import httpx
+
+
+def create_client(
+    max_connections: int,
+    max_keepalive: int,
+    keepalive_expiry: float,
+    connect_timeout: float,
+    read_timeout: float,
+    http2: bool = False,
+    **kwargs
+) -> httpx.AsyncClient:
+    """Async HTTP client with explicit pool limits and timeouts"""
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            raise RuntimeError("HTTP/2 requires h2 package: pip install httpx[http2]")
+    
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=connect_timeout),
+        http2=http2,
+        **kwargs
+    )
+
+
+def pool_stats(client: httpx.AsyncClient) -> dict:
+    """Connection pool usage of a client (httpcore pool internals)"""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    requests = getattr(pool, "_requests", [])
+    connections = getattr(pool, "_connections", [])
+    queued = sum(1 for request in requests if request.is_queued())
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {
+        "requests_active": len(requests) - queued,
+        "requests_queued": queued,
+        "connections_active": len(connections) - idle,
+        "connections_idle": idle,
+        "closed": client.is_closed
+    }
@@ -0,0 +1,131 @@
+import asyncio
+import bisect
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+DEFAULT_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+
+def metric_name(name: str, labels: Dict[str, str]) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{key}={value}" for key, value in sorted(labels.items())) + "}"
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets"""
+    
+    def __init__(self, buckets: List[float] = None):
+        self.buckets = buckets or DEFAULT_BUCKETS
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+    
+    def quantile(self, q: float) -> float:
+        """Approximate quantile as the upper bound of the matching bucket"""
+        if not self.count:
+            return 0.0
+        
+        threshold = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= threshold:
+                return bound
+        return self.max
+    
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Metrics:
+    """In-process metrics registry"""
+    
+    def __init__(self):
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.collectors: Dict[str, Callable[[], dict]] = {}
+    
+    def inc(self, name: str, value: float = 1, **labels):
+        self.counters[metric_name(name, labels)] += value
+    
+    def set(self, name: str, value: float, **labels):
+        self.gauges[metric_name(name, labels)] = value
+    
+    def observe(self, name: str, value: float, buckets: List[float] = None, **labels):
+        key = metric_name(name, labels)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram(buckets)
+        self.histograms[key].observe(value)
+    
+    def register(self, name: str, collector: Callable[[], dict]):
+        """Register callable returning current stats of a component"""
+        self.collectors[name] = collector
+    
+    def snapshot(self) -> dict:
+        return {
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            "components": {name: collector() for name, collector in self.collectors.items()}
+        }
+    
+    def publish(self, path: str):
+        """Write snapshot to a JSON file other processes can read"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({**self.snapshot(), "published_at": time.time()}, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+    
+    async def publish_periodically(self, path: str, interval: float):
+        """Publish snapshot every interval seconds until cancelled"""
+        try:
+            while True:
+                self.publish(path)
+                await asyncio.sleep(interval)
+        finally:
+            self.publish(path)
+    
+    def reset(self):
+        self.counters.clear()
+        self.gauges.clear()
+        self.histograms.clear()
+
+
+def load_published(directory: str) -> Dict[str, dict]:
+    """Snapshots published by other processes, by file name"""
+    if not os.path.isdir(directory):
+        return {}
+    
+    snapshots = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".json"):
+            try:
+                with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                    snapshots[filename[:-5]] = json.load(f)
+            except (OSError, ValueError):
+                continue
+    return snapshots
+
+
+# Global instance
+metrics = Metrics()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the users export query.
+
+Seeds N users with interests into an in-memory SQLite database and compares
+the legacy per-user interests lookup (N+1 queries) with the set-based export
+query by number of executed statements and wall time.
+
+Usage:
+    python -m benchmarks.export_users --sizes 100 1000 10000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.database.models import Base, User, Region, Interest, UserInterest
+from app.reports.queries import users_export_query, users_export_row
+
+INTERESTS_PER_USER = 3
+
+
+async def seed(session: AsyncSession, users_count: int):
+    """Seed regions, interests and users"""
+    await session.execute(insert(Region), [{"name": f"Регион {i}"} for i in range(10)])
+    await session.execute(insert(Interest), [{"name": f"Интерес {i}"} for i in range(20)])
+    await session.execute(insert(User), [
+        {
+            "telegram_id": i,
+            "phone_number": f"+7{i:010d}",
+            "first_name": f"Имя {i}",
+            "last_name": f"Фамилия {i}",
+            "age": 18 + i % 50,
+            "region_id": 1 + i % 10,
+        }
+        for i in range(users_count)
+    ])
+    await session.execute(insert(UserInterest), [
+        {"user_id": user_id, "interest_id": interest_id}
+        for user_id in range(1, users_count + 1)
+        for interest_id in random.sample(range(1, 21), INTERESTS_PER_USER)
+    ])
+    await session.commit()
+
+
+async def legacy_export(session: AsyncSession) -> int:
+    """Per-user interests lookup as it was done before"""
+    result = await session.execute(
+        select(User, Region.name.label('region_name'))
+        .join(Region, User.region_id == Region.id)
+    )
+    rows = 0
+    for user, region_name in result.all():
+        interests_result = await session.execute(
+            select(Interest.name)
+            .join(UserInterest, Interest.id == UserInterest.interest_id)
+            .where(UserInterest.user_id == user.id)
+        )
+        interests = [interest[0] for interest in interests_result.all()]
+        rows += 1
+    return rows
+
+
+async def set_based_export(session: AsyncSession) -> int:
+    """Single aggregated export query"""
+    result = await session.execute(users_export_query())
+    return len([users_export_row(row) for row in result.all()])
+
+
+async def run(users_count: int):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    statements = {"count": 0}
+    
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*args):
+        statements["count"] += 1
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        await seed(session, users_count)
+    
+    for name, export in (("legacy", legacy_export), ("set-based", set_based_export)):
+        async with session_factory() as session:
+            statements["count"] = 0
+            started = time.perf_counter()
+            rows = await export(session)
+            elapsed = time.perf_counter() - started
+            print(f"{users_count:>8} {name:>10} {rows:>8} rows {statements['count']:>8} queries {elapsed * 1000:>10.1f} ms")
+    
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Users export benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+    
+    for users_count in args.sizes:
+        asyncio.run(run(users_count))
+
+
+if __name__ == "__main__":
+    main()
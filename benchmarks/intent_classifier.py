@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the local intent classifier.
+
+Classifies the data/nlu.yml examples and their noisy variants with the
+in-process classifier and reports latency and the share of messages it
+answers without Rasa. With --rasa-url the same texts are sent to
+/model/parse to compare latency and agreement on locally answered texts;
+without it, labels of held-out examples (leave-one-out) are used instead.
+
+Usage:
+    python -m benchmarks.intent_classifier
+    python -m benchmarks.intent_classifier --rasa-url http://localhost:5005
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Optional, Tuple
+
+import httpx
+
+from app.rasa.classifier import IntentClassifier, load_nlu_examples
+
+
+def variants(examples: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Training texts plus capitalized, punctuated and padded variants"""
+    texts = []
+    for text, intent in examples:
+        texts.append((text, intent))
+        texts.append((text.capitalize() + "!", intent))
+        texts.append((f"ну {text} пожалуйста", intent))
+    return texts
+
+
+def local_predictions(
+    examples: List[Tuple[str, str]], min_confidence: float, min_margin: float, leave_one_out: bool
+) -> Tuple[List[Optional[str]], List[float]]:
+    """Local intents (None when forwarded to Rasa) and per-text latency"""
+    texts = variants(examples)
+    classifier = IntentClassifier().fit(examples)
+    intents, latencies = [], []
+    
+    for i, (text, _) in enumerate(texts):
+        if leave_one_out:
+            # Three variants per example, hold the source example out
+            source = i // 3
+            classifier = IntentClassifier().fit(examples[:source] + examples[source + 1:])
+        started = time.perf_counter()
+        intents.append(classifier.classify(text, min_confidence, min_margin))
+        latencies.append(time.perf_counter() - started)
+    return intents, latencies
+
+
+async def rasa_predictions(url: str, texts: List[str]) -> Tuple[List[Optional[str]], List[float]]:
+    intents, latencies = [], []
+    async with httpx.AsyncClient(timeout=30) as client:
+        for text in texts:
+            started = time.perf_counter()
+            response = await client.post(f"{url}/model/parse", json={"text": text})
+            latencies.append(time.perf_counter() - started)
+            intents.append(response.json().get("intent", {}).get("name"))
+    return intents, latencies
+
+
+def report(name: str, latencies: List[float]):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:>6}: median {statistics.median(latencies) * 1e6:>10.1f} us   p95 {p95 * 1e6:>10.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local intent classifier benchmark")
+    parser.add_argument("--nlu", default="data/nlu.yml")
+    parser.add_argument("--rasa-url", default=None)
+    parser.add_argument("--min-confidence", type=float, default=0.6)
+    parser.add_argument("--min-margin", type=float, default=0.2)
+    args = parser.parse_args()
+    
+    examples = load_nlu_examples(args.nlu)
+    texts = variants(examples)
+    leave_one_out = args.rasa_url is None
+    local, local_latencies = local_predictions(examples, args.min_confidence, args.min_margin, leave_one_out)
+    
+    if args.rasa_url:
+        reference, rasa_latencies = asyncio.run(rasa_predictions(args.rasa_url, [text for text, _ in texts]))
+    else:
+        reference, rasa_latencies = [intent for _, intent in texts], None
+    
+    answered = [(intent, expected) for intent, expected in zip(local, reference) if intent is not None]
+    agreed = sum(1 for intent, expected in answered if intent == expected)
+    
+    print(f"{len(texts)} texts, {len(answered)} answered locally ({len(answered) / len(texts):.0%})")
+    print(f"agreement with {'Rasa' if args.rasa_url else 'held-out labels'}: "
+          f"{agreed}/{len(answered)} ({agreed / max(len(answered), 1):.0%})")
+    report("local", local_latencies)
+    if rasa_latencies:
+        report("rasa", rasa_latencies)
+
+
+if __name__ == "__main__":
+    main()
@@ -32,8 +32,12 @@ def main():
     api_process.start()
     
     try:
-        # Run bot in main process
-        asyncio.run(run_bot())
+        if settings.bot_mode == "webhook":
+            # Updates are handled by the API process
+            api_process.join()
+        else:
+            # Run bot in main process
+            asyncio.run(run_bot())
     except KeyboardInterrupt:
         print("\nShutting down...")
     finally:
@@ -13,6 +13,8 @@ Commands:
     init-db                  Initialize database
     create-admin             Create admin user
     test                     Run tests
+    post-update FILE         Post recorded Telegram update JSON to the local webhook
+    classify FILE            Classify JSONL messages with Rasa (--concurrency, --output)
     """
 
 import sys
@@ -175,6 +177,70 @@ def run_tests():
     return result.returncode
 
 
+def post_update(path: str):
+    """Post recorded update JSON to the webhook endpoint of the running API"""
+    import json
+    import httpx
+    
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    
+    updates = data if isinstance(data, list) else [data]
+    url = f"http://localhost:{settings.api_port}/api/telegram/webhook"
+    headers = {"X-Telegram-Bot-Api-Secret-Token": settings.telegram_webhook_secret}
+    
+    with httpx.Client(timeout=10) as client:
+        for update in updates:
+            response = client.post(url, json=update, headers=headers)
+            print(f"Update {update.get('update_id')}: {response.status_code} {response.text}")
+
+
+async def classify(path: str, output: str = None, concurrency: int = None, batch_size: int = 1000):
+    """Classify messages from a JSONL file (strings or objects with "text")"""
+    import json
+    import time
+    from app.rasa.integration import rasa_integration, intent_from_parse
+    
+    output = output or f"{Path(path).with_suffix('')}.intents.jsonl"
+    total = failed = 0
+    started = time.perf_counter()
+    
+    async def write_batch(texts, out):
+        nonlocal total, failed
+        results = await rasa_integration.parse_many(texts, concurrency=concurrency)
+        for text, result in zip(texts, results):
+            if result is None:
+                failed += 1
+            out.write(json.dumps({
+                "text": text,
+                "intent": intent_from_parse(result) if result else None,
+                "confidence": (result.get("intent") or {}).get("confidence") if result else None
+            }, ensure_ascii=False) + "\n")
+        total += len(texts)
+        elapsed = time.perf_counter() - started
+        print(f"{total} messages, {total / elapsed:.1f} messages/s")
+    
+    try:
+        with open(path, encoding="utf-8") as f, open(output, "w", encoding="utf-8") as out:
+            texts = []
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                texts.append(item if isinstance(item, str) else item["text"])
+                if len(texts) >= batch_size:
+                    await write_batch(texts, out)
+                    texts = []
+            if texts:
+                await write_batch(texts, out)
+    finally:
+        await rasa_integration.close()
+    
+    elapsed = time.perf_counter() - started
+    print(f"Classified {total} messages ({failed} failed) in {elapsed:.1f}s, "
+          f"{total / elapsed if elapsed else 0:.1f} messages/s -> {output}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Test Bot Management Script",
@@ -184,9 +250,12 @@ def main():
     
     parser.add_argument(
         "command",
-        choices=["start", "bot", "api", "rasa", "init-db", "create-admin", "test"],
+        choices=["start", "bot", "api", "rasa", "init-db", "create-admin", "test", "post-update", "classify"],
         help="Command to run"
     )
+    parser.add_argument("path", nargs="?", help="Input file for post-update and classify")
+    parser.add_argument("--output", help="Output JSONL file for classify")
+    parser.add_argument("--concurrency", type=int, help="Parallel Rasa requests for classify")
     
     args = parser.parse_args()
     
@@ -213,6 +282,16 @@ def main():
     elif args.command == "test":
         exit_code = run_tests()
         sys.exit(exit_code)
+    
+    elif args.command == "post-update":
+        if not args.path:
+            parser.error("post-update requires a JSON file path")
+        post_update(args.path)
+    
+    elif args.command == "classify":
+        if not args.path:
+            parser.error("classify requires a JSONL file path")
+        asyncio.run(classify(args.path, args.output, args.concurrency))
 
 
 if __name__ == "__main__":